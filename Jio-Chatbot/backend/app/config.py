@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict
 
@@ -77,6 +78,7 @@ def get_company_config() -> Dict[str, str]:
 # AUTHENTICATION & SECURITY
 # ============================================================================
 
+@lru_cache(maxsize=1)
 def auth_disabled() -> bool:
     """Check if authentication is disabled (for development only)"""
     return os.getenv("DISABLE_AUTH", "false").strip().lower() in {"1", "true", "yes"}
@@ -93,7 +95,12 @@ def get_gemini_api_key() -> str:
     """Get Google Gemini API key"""
     return os.getenv("GOOGLE_GEMINI_API_KEY", "")
 
+def get_redis_url() -> str:
+    """Get Redis connection URL (optional, for OTP storage shared across workers)"""
+    return os.getenv("REDIS_URL", "")
+
 # Backward compatibility aliases (deprecated - use get_company_name() instead)
+@lru_cache(maxsize=1)
 def org_name() -> str:
     """Deprecated: Use get_company_name() instead"""
     return get_company_name()
@@ -1,7 +1,9 @@
 import os
+import logging
 from pathlib import Path
 from dotenv import load_dotenv
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
@@ -16,10 +18,22 @@ else:
     load_dotenv()
     print("[WARNING] Using fallback environment loading")
 
+# Configure logging once for the whole app
+logging.basicConfig(level=logging.INFO)
+
 from .routers import chat, documents, certificates, health, gemini_documents, advanced_qa, document_requests, auth
 from .services.db import db_service
+from .services.doc_parser import shutdown_parse_pool
+
+# Serialize JSON responses with orjson when it is installed
+try:
+    import orjson  # noqa: F401
+    default_response_class = ORJSONResponse
+except ImportError:
+    print("[WARNING] orjson not installed - using standard JSON responses")
+    default_response_class = JSONResponse
 
-app = FastAPI(title="Org AI Chatbot", version="0.1.0")
+app = FastAPI(title="Org AI Chatbot", version="0.1.0", default_response_class=default_response_class)
 
 @app.on_event("startup")
 async def startup_event():
@@ -28,8 +42,9 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close database connection on shutdown"""
+    """Close database connection and document parse workers on shutdown"""
     await db_service.disconnect()
+    shutdown_parse_pool()
 
 app.add_middleware(
     CORSMiddleware,
@@ -1,15 +1,15 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import asyncio
 from datetime import datetime
 
-from ..services.qa_engine import HybridQAEngine
+from ..services.qa_engine import get_qa_engine
 
 router = APIRouter()
 
 # Initialize services
-qa_engine = HybridQAEngine()
+qa_engine = get_qa_engine()
 
 
 class FeedbackRequest(BaseModel):
@@ -40,8 +40,8 @@ class QAStatistics(BaseModel):
 
 
 @router.post("/generate-qa", response_model=Dict)
-async def generate_qa_from_documents(background_tasks: BackgroundTasks):
-    """Generate Q&A pairs from policy documents in the background"""
+async def generate_qa_from_documents():
+    """Report the QA generation mode (no background generation is scheduled)"""
     try:
         # Note: This feature is now simplified to use only Gemini API
         # No local dataset generation needed
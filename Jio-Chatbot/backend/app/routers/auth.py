@@ -1,77 +1,136 @@
 import os
+import hmac
 import json
+import logging
 import random
 import smtplib
 import time
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from fastapi.security import HTTPBearer
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 import jwt
 from dotenv import load_dotenv
 from ..services.db import db_service
-from ..config import get_app_name
+from ..config import get_app_name, get_redis_url
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 security = HTTPBearer()
 
 # In-memory storage for OTPs (in production, use Redis or database)
-otp_storage: Dict[str, Dict] = {}
+# Every OTP lives for the same duration, so insertion order is also expiry order
+OTP_EXPIRY_MINUTES = 5
+OTP_STORAGE_MAX = 10000
+otp_storage: "OrderedDict[str, Dict]" = OrderedDict()
+
+# Shared OTP storage across workers when REDIS_URL is configured
+_redis_client = None
+_redis_checked = False
 
 # JWT secret key (in production, use a secure secret)
 JWT_SECRET = os.getenv("JWT_SECRET", "your-secret-key-change-in-production")
 JWT_ALGORITHM = "HS256"
+JWT_ALGORITHMS = (JWT_ALGORITHM,)
+if JWT_SECRET == "your-secret-key-change-in-production":
+    print("[WARNING] JWT_SECRET is not set - using the insecure default secret")
+
+# Secret encoded once and a single PyJWT instance reused for every token
+_jwt_key = JWT_SECRET.encode("utf-8")
+_jwt = jwt.PyJWT()
+
+# Decoded JWT payloads keyed by raw token, dropped at the token's own expiry
+JWT_CACHE_SIZE = 4096
+_token_cache: "OrderedDict[str, Dict]" = OrderedDict()
+
+# Longest address allowed by RFC 5321
+MAX_EMAIL_LENGTH = 254
+
+def _precheck_email(v):
+    """Reject obviously malformed emails before the full EmailStr parse runs"""
+    if isinstance(v, str) and (len(v) > MAX_EMAIL_LENGTH or v.count('@') != 1):
+        raise ValueError('Invalid email address')
+    return v
 
 class EmailRequest(BaseModel):
     email: EmailStr
+    
+    _precheck = field_validator('email', mode='before')(_precheck_email)
 
 class OTPVerification(BaseModel):
     email: EmailStr
     otp: str
+    
+    _precheck = field_validator('email', mode='before')(_precheck_email)
 
 class AuthResponse(BaseModel):
     success: bool
     message: str
     token: Optional[str] = None
 
+@lru_cache(maxsize=1)
+def _read_employees_file(json_path: str, mtime: float) -> List[Dict]:
+    """Read employees.json once per modification time (failed reads are retried on the next call)"""
+    logger.debug("Loading employees from: %s", json_path)
+    with open(json_path, "r", encoding="utf-8") as f:
+        employees = json.load(f)
+    logger.debug("Successfully loaded %d employees from local JSON", len(employees))
+    return employees
+
+# Only the first 4 employees in employees.json are allowed to login
+ALLOWED_LOGIN_COUNT = 4
+
+@lru_cache(maxsize=1)
+def _index_allowed_employees(json_path: str, mtime: float) -> Dict[str, Dict]:
+    """Lowercased email -> employee for the employees allowed to login, built once per file load"""
+    allowed: Dict[str, Dict] = {}
+    for emp in _read_employees_file(json_path, mtime)[:ALLOWED_LOGIN_COUNT]:
+        if emp.get("email"):
+            allowed.setdefault(emp["email"].lower(), emp)  # First entry wins, as with a linear scan
+    return allowed
+
+def _employees_json_path() -> str:
+    # ALWAYS use local JSON file for authentication
+    # This ensures the correct team members (from employees.json) can login
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, "data", "employees.json")
+
+def _employees_file_key():
+    """(path, mtime) of employees.json, so edits to the file are picked up without a restart"""
+    json_path = _employees_json_path()
+    return json_path, os.stat(json_path).st_mtime
+
 async def load_employees():
     """Load employees from local JSON file (for authentication, always use local data)"""
     try:
-        # ALWAYS use local JSON file for authentication
-        # This ensures the correct team members (from employees.json) can login
-        import os
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        json_path = os.path.join(base_dir, "data", "employees.json")
-        
-        print(f"[DEBUG] Loading employees from: {json_path}")
-        
-        with open(json_path, "r", encoding="utf-8") as f:
-            employees = json.load(f)
-            print(f"[DEBUG] Successfully loaded {len(employees)} employees from local JSON")
-            return employees
+        return _read_employees_file(*_employees_file_key())
     except Exception as e:
         print(f"[ERROR] Error loading employees: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Employee database not found: {str(e)}")
 
+async def load_allowed_employees() -> Dict[str, Dict]:
+    """Employees allowed to login, keyed by lowercased email"""
+    await load_employees()  # Surfaces a missing/invalid employees file as HTTP 500
+    return _index_allowed_employees(*_employees_file_key())
+
 async def is_valid_employee(email: str) -> bool:
     """Check if email belongs to one of the first 4 employees"""
     try:
-        employees = await load_employees()
-        print(f"[DEBUG] Loaded {len(employees)} employees from database")
-        
-        # Only first 4 employees are allowed to login
-        allowed_employees = employees[:4]
-        print(f"[DEBUG] First 4 employees: {[emp.get('email', 'N/A') for emp in allowed_employees]}")
-        print(f"[DEBUG] Checking email: {email.lower()}")
+        allowed_employees = await load_allowed_employees()
+        email_lower = email.lower()
         
-        is_valid = any(emp["email"].lower() == email.lower() for emp in allowed_employees)
-        print(f"[DEBUG] Is valid employee: {is_valid}")
+        is_valid = email_lower in allowed_employees
+        # One line per check, without echoing the allow-list
+        logger.debug("Checking email: %s -> valid employee: %s", email_lower, is_valid)
         
         return is_valid
     except Exception as e:
@@ -82,16 +141,94 @@ async def is_valid_employee(email: str) -> bool:
 
 async def get_employee_by_email(email: str):
     """Get employee details by email"""
-    employees = await load_employees()
-    for emp in employees[:4]:  # Only check first 4 employees
-        if emp["email"].lower() == email.lower():
-            return emp
-    return None
+    allowed_employees = await load_allowed_employees()  # Only the first 4 employees
+    return allowed_employees.get(email.lower())
 
 def generate_otp() -> str:
     """Generate a 6-digit OTP"""
     return str(random.randint(100000, 999999))
 
+def _get_redis():
+    """Get the Redis client for OTP storage, or None to use in-memory storage"""
+    global _redis_client, _redis_checked
+    if not _redis_checked:
+        _redis_checked = True
+        redis_url = get_redis_url()
+        if redis_url:
+            try:
+                import redis.asyncio as redis_asyncio
+                _redis_client = redis_asyncio.from_url(redis_url, decode_responses=True)
+                print("[OK] Using Redis for OTP storage")
+            except ImportError:
+                print("[WARNING] REDIS_URL is set but the redis package is not installed - using in-memory OTP storage")
+    return _redis_client
+
+def _otp_key(email: str) -> str:
+    return f"otp:{email}"
+
+# Count an attempt only while the OTP entry still exists, so an entry that expires
+# between the read and the increment is not recreated without its OTP and TTL
+_INCR_ATTEMPTS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+end
+return nil
+"""
+
+async def store_otp(email: str, otp: str) -> None:
+    """Store a fresh OTP for the email, evicting expired (or excess) entries"""
+    client = _get_redis()
+    if client is not None:
+        # Redis expires the entry itself
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.delete(_otp_key(email))
+            pipe.hset(_otp_key(email), mapping={"otp": otp, "attempts": 0})
+            pipe.expire(_otp_key(email), OTP_EXPIRY_MINUTES * 60)
+            await pipe.execute()
+        return
+    
+    now = datetime.now(timezone.utc)
+    otp_storage.pop(email, None)
+    while otp_storage:
+        oldest_email, oldest = next(iter(otp_storage.items()))
+        if oldest["expiry"] > now and len(otp_storage) < OTP_STORAGE_MAX:
+            break
+        del otp_storage[oldest_email]
+    
+    otp_storage[email] = {
+        "otp": otp,
+        "expiry": now + timedelta(minutes=OTP_EXPIRY_MINUTES),
+        "attempts": 0
+    }
+
+async def get_otp(email: str) -> Optional[Dict]:
+    """Get the stored OTP entry (otp, expiry, attempts) for the email"""
+    client = _get_redis()
+    if client is not None:
+        data = await client.hgetall(_otp_key(email))
+        # Expired entries are already gone from Redis; a hash without an OTP counts as none found
+        if not data or not data.get("otp"):
+            return None
+        return {"otp": data["otp"], "expiry": None, "attempts": int(data.get("attempts", 0))}
+    return otp_storage.get(email)
+
+async def record_failed_otp_attempt(email: str) -> None:
+    """Count a failed verification attempt"""
+    client = _get_redis()
+    if client is not None:
+        await client.eval(_INCR_ATTEMPTS_SCRIPT, 1, _otp_key(email))
+        return
+    if email in otp_storage:
+        otp_storage[email]["attempts"] += 1
+
+async def delete_otp(email: str) -> None:
+    """Remove the stored OTP for the email"""
+    client = _get_redis()
+    if client is not None:
+        await client.delete(_otp_key(email))
+        return
+    otp_storage.pop(email, None)
+
 def send_email_otp(email: str, otp: str) -> bool:
     """Send OTP via email using Gmail SMTP"""
     try:
@@ -147,19 +284,33 @@ def create_jwt_token(email: str, emp_id: int) -> str:
     payload = {
         "email": email,
         "emp_id": emp_id,
-        "exp": datetime.utcnow() + timedelta(hours=24)  # 24 hour expiry
+        "exp": datetime.now(timezone.utc) + timedelta(hours=24)  # 24 hour expiry
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    return _jwt.encode(payload, _jwt_key, algorithm=JWT_ALGORITHM)
 
 def verify_jwt_token(token: str) -> Dict:
     """Verify JWT token and return payload"""
+    cached = _token_cache.get(token)
+    if cached is not None:
+        if cached["exp"] > time.time():
+            _token_cache.move_to_end(token)
+            return dict(cached)  # Callers may mutate the payload; keep the cached entry intact
+        _token_cache.pop(token, None)
+        raise HTTPException(status_code=401, detail="Token has expired")
+    
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload
+        payload = _jwt.decode(token, _jwt_key, algorithms=JWT_ALGORITHMS)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    
+    # Only tokens carrying an expiry are cached, so every entry ages out
+    if "exp" in payload:
+        _token_cache[token] = dict(payload)
+        if len(_token_cache) > JWT_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return payload
 
 @router.post("/send-otp", response_model=AuthResponse)
 async def send_otp(request: EmailRequest):
@@ -170,16 +321,9 @@ async def send_otp(request: EmailRequest):
     if not await is_valid_employee(email):
         raise HTTPException(status_code=400, detail="Invalid Email ID")
     
-    # Generate OTP
+    # Generate and store OTP with expiry
     otp = generate_otp()
-    expiry_time = datetime.utcnow() + timedelta(minutes=5)
-    
-    # Store OTP with expiry
-    otp_storage[email] = {
-        "otp": otp,
-        "expiry": expiry_time,
-        "attempts": 0
-    }
+    await store_otp(email, otp)
     
     # Send OTP via email
     if send_email_otp(email, otp):
@@ -197,24 +341,23 @@ async def verify_otp(request: OTPVerification, response: Response):
     otp = request.otp
     
     # Check if OTP exists
-    if email not in otp_storage:
+    otp_data = await get_otp(email)
+    if otp_data is None:
         raise HTTPException(status_code=400, detail="No OTP found. Please request a new OTP")
     
-    otp_data = otp_storage[email]
-    
     # Check if OTP has expired
-    if datetime.utcnow() > otp_data["expiry"]:
-        del otp_storage[email]
+    if otp_data["expiry"] is not None and datetime.now(timezone.utc) > otp_data["expiry"]:
+        await delete_otp(email)
         raise HTTPException(status_code=400, detail="OTP has expired. Please request a new OTP")
     
     # Check attempts
     if otp_data["attempts"] >= 3:
-        del otp_storage[email]
+        await delete_otp(email)
         raise HTTPException(status_code=400, detail="Too many failed attempts. Please request a new OTP")
     
-    # Verify OTP
-    if otp_data["otp"] != otp:
-        otp_data["attempts"] += 1
+    # Verify OTP (constant-time comparison)
+    if not hmac.compare_digest(otp_data["otp"].encode(), otp.encode()):
+        await record_failed_otp_attempt(email)
         raise HTTPException(status_code=400, detail="Invalid OTP")
     
     # Get employee details
@@ -226,7 +369,7 @@ async def verify_otp(request: OTPVerification, response: Response):
     token = create_jwt_token(email, employee["emp_id"])
     
     # Clear OTP from storage
-    del otp_storage[email]
+    await delete_otp(email)
     
     # Set session cookie
     response.set_cookie(
@@ -253,20 +396,9 @@ async def resend_otp(request: EmailRequest):
     if not await is_valid_employee(email):
         raise HTTPException(status_code=400, detail="Invalid Email ID")
     
-    # Remove existing OTP if any
-    if email in otp_storage:
-        del otp_storage[email]
-    
-    # Generate new OTP
+    # Generate and store new OTP (replaces any existing one)
     otp = generate_otp()
-    expiry_time = datetime.utcnow() + timedelta(minutes=5)
-    
-    # Store new OTP
-    otp_storage[email] = {
-        "otp": otp,
-        "expiry": expiry_time,
-        "attempts": 0
-    }
+    await store_otp(email, otp)
     
     # Send new OTP via email
     if send_email_otp(email, otp):
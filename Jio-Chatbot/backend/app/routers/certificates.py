@@ -1,4 +1,3 @@
-import re
 from io import BytesIO
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends, Request
@@ -7,14 +6,13 @@ from pydantic import BaseModel, Field, validator
 from typing import List, Dict, Optional
 import logging
 
+from ..services.bad_language_filter import HARMFUL_PATTERN_RE
 from ..services.certificate_generator import generate_bonafide_pdf
-from ..services.employee_validator import EmployeeValidator
+from ..services.employee_validator import get_employee_validator
 from ..services.db import db_service
-from ..config import auth_disabled, get_company_name
+from ..config import auth_disabled, org_name
 from .auth import get_current_user_dependency
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -29,7 +27,7 @@ def initialize_services():
     try:
         # Initialize employee validator
         try:
-            employee_validator = EmployeeValidator()
+            employee_validator = get_employee_validator()
             logger.info("✅ Employee validator initialized successfully")
         except Exception as e:
             logger.error(f"❌ Failed to initialize employee validator: {str(e)}")
@@ -47,10 +45,6 @@ def initialize_services():
 # Initialize services on module load
 initialize_services()
 
-def org_name():
-    """Get organization name (uses configurable company name)"""
-    return get_company_name()
-
 # Utility function to validate input content
 def validate_input_content(content: str, max_length: int = 100) -> { 'is_valid': bool, 'error': str }:
     """Validate input content for security and length"""
@@ -64,19 +58,9 @@ def validate_input_content(content: str, max_length: int = 100) -> { 'is_valid':
     if len(trimmed) > max_length:
         return { 'is_valid': False, 'error': f'Content is too long (maximum {max_length} characters)' }
     
-    # Check for potentially harmful patterns
-    harmful_patterns = [
-        r'<script[^>]*>.*?</script>',  # Script tags
-        r'javascript:',  # JavaScript protocol
-        r'data:text/html',  # Data URLs
-        r'vbscript:',  # VBScript protocol
-        r'<iframe[^>]*>',  # Iframe tags
-        r'on\w+\s*=',  # Event handlers
-    ]
-    
-    for pattern in harmful_patterns:
-        if re.search(pattern, trimmed, re.IGNORECASE):
-            return { 'is_valid': False, 'error': 'Content contains potentially harmful patterns' }
+    # Check for potentially harmful patterns (every pattern needs '<', ':' or '=')
+    if ('<' in trimmed or ':' in trimmed or '=' in trimmed) and HARMFUL_PATTERN_RE.search(trimmed):
+        return { 'is_valid': False, 'error': 'Content contains potentially harmful patterns' }
     
     return { 'is_valid': True, 'error': None }
 
@@ -5,19 +5,18 @@ from typing import List, Dict, Optional
 from datetime import datetime
 from io import BytesIO
 import json
+import asyncio
 import logging
 
-from ..services.document_request_handler import DocumentRequestHandler
+from ..services.document_request_handler import get_document_request_handler
 from .auth import get_current_user_dependency
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 # Initialize document request handler
-doc_handler = DocumentRequestHandler()
+doc_handler = get_document_request_handler()
 
 
 class DocumentRequest(BaseModel):
@@ -82,8 +81,8 @@ async def submit_document_request(
             if not requested_emp_id.isdigit() and requested_emp_id:
                 # Resolve employee_code to numeric emp_id
                 try:
-                    from ..services.employee_validator import EmployeeValidator
-                    validator = EmployeeValidator()
+                    from ..services.employee_validator import get_employee_validator
+                    validator = get_employee_validator()
                     emp = validator.get_employee_by_id(requested_emp_id)
                     if emp and 'emp_id' in emp:
                         requested_emp_id = str(emp['emp_id'])
@@ -110,8 +109,10 @@ async def submit_document_request(
             logger.error(f"Error validating employee ID: {str(e)}")
             raise HTTPException(status_code=400, detail="Failed to validate request")
         
-        # Submit the request and generate PDF (user_id is now authenticated user's ID)
-        submitted_request = doc_handler.submit_document_request(
+        # Submit the request and generate PDF (user_id is now authenticated user's ID);
+        # rendering is CPU-bound, so run it in a worker thread instead of on the event loop
+        submitted_request = await asyncio.to_thread(
+            doc_handler.submit_document_request,
             doc_type=doc_type,
             doc_name=doc_name,
             details=request.details,
@@ -1,14 +1,21 @@
 import os
+import re
 import fitz  # PyMuPDF
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from pydantic import BaseModel
 from ..config import auth_disabled
-from ..services.gemini_summarizer import GeminiSummarizer
+from ..services.gemini_summarizer import get_gemini_summarizer
 
 router = APIRouter()
 
-# Initialize the Gemini summarizer service
-summarizer = GeminiSummarizer()
+
+# Upload limits
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Keyword extraction: capitalized words, minus common words
+_CAPITALIZED_WORD_RE = re.compile(r'\b[A-Z][a-z]+\b')
+_KEYWORD_STOP_WORDS = frozenset({'The', 'This', 'That', 'With', 'From', 'Have', 'Will', 'Are', 'For', 'And', 'But', 'Not', 'You', 'All', 'Any', 'Can', 'Had', 'Her', 'Was', 'One', 'Our', 'Out', 'Day', 'Get', 'Has', 'Him', 'His', 'How', 'Man', 'New', 'Now', 'Old', 'See', 'Two', 'Way', 'Who', 'Boy', 'Did', 'Its', 'Let', 'Put', 'Say', 'She', 'Too', 'Use'})
 
 
 class SummarizeResponse(BaseModel):
@@ -23,26 +30,46 @@ class SummarizeResponse(BaseModel):
 
 def extract_text_from_pdf(content: bytes) -> str:
     """Extract text from PDF content"""
-    text = ""
     try:
-        doc = fitz.open(stream=content, filetype="pdf")
-        for page in doc:
-            text += page.get_text()
-        doc.close()
+        with fitz.open(stream=content, filetype="pdf") as doc:
+            return "".join(page.get_text() for page in doc)
     except Exception as e:
         raise Exception(f"Failed to extract text from PDF: {e}")
-    return text
 
 
 def extract_keywords(text: str) -> list[str]:
     """Extract keywords from text"""
-    # Simple keyword extraction - look for capitalized words and common terms
-    import re
-    words = re.findall(r'\b[A-Z][a-z]+\b', text)
-    # Remove common words
-    stop_words = {'The', 'This', 'That', 'With', 'From', 'Have', 'Will', 'Are', 'For', 'And', 'But', 'Not', 'You', 'All', 'Any', 'Can', 'Had', 'Her', 'Was', 'One', 'Our', 'Out', 'Day', 'Get', 'Has', 'Him', 'His', 'How', 'Man', 'New', 'Now', 'Old', 'See', 'Two', 'Way', 'Who', 'Boy', 'Did', 'Its', 'Let', 'Put', 'Say', 'She', 'Too', 'Use'}
-    keywords = [word for word in words if word not in stop_words and len(word) > 3]
-    return list(set(keywords))[:10]  # Return unique keywords, max 10
+    # Simple keyword extraction - look for capitalized words and common terms,
+    # stopping as soon as 10 unique keywords have been seen
+    keywords = []
+    seen = set()
+    for match in _CAPITALIZED_WORD_RE.finditer(text):
+        word = match.group()
+        if len(word) > 3 and word not in _KEYWORD_STOP_WORDS and word not in seen:
+            seen.add(word)
+            keywords.append(word)
+            if len(keywords) == 10:
+                break
+    return keywords  # Unique keywords, max 10
+
+
+async def read_upload(file: UploadFile, max_size: int = MAX_UPLOAD_SIZE) -> bytes:
+    """Read an uploaded file in chunks, rejecting it as soon as it exceeds max_size"""
+    # The multipart parser already spooled the body; reject by declared size when known
+    if file.size is not None and file.size > max_size:
+        raise HTTPException(status_code=400, detail="File size too large. Maximum 50MB allowed.")
+    
+    chunks = []
+    total = 0
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_size:
+            raise HTTPException(status_code=400, detail="File size too large. Maximum 50MB allowed.")
+        chunks.append(chunk)
+    return b"".join(chunks)
 
 
 @router.post("/upload", response_model=SummarizeResponse)
@@ -53,17 +80,15 @@ async def upload(file: UploadFile = File(...)):
         if not file.filename or not file.filename.lower().endswith('.pdf'):
             raise HTTPException(status_code=400, detail="Only PDF files are supported")
         
-        # Check file size (limit to 50MB)
-        content = await file.read()
-        if len(content) > 50 * 1024 * 1024:  # 50MB
-            raise HTTPException(status_code=400, detail="File size too large. Maximum 50MB allowed.")
+        # Read file in chunks (limit to 50MB)
+        content = await read_upload(file)
         
         if len(content) == 0:
             raise HTTPException(status_code=400, detail="File is empty")
         
         # Use Gemini summarizer for processing
         try:
-            result = await summarizer.summarize_pdf(file.filename, content)
+            result = await get_gemini_summarizer().summarize_pdf(file.filename, content)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to generate summary: {str(e)}")
         
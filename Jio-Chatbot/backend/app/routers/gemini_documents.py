@@ -9,16 +9,15 @@ import json
 from datetime import datetime
 import os
 
-from ..services.gemini_summarizer import GeminiSummarizer, SummaryResult
+from ..services.gemini_summarizer import get_gemini_summarizer, SummaryResult
 from ..services.keyword_extractor import KeywordExtractor
-from ..services.doc_parser import parse_document
+from ..services.doc_parser import parse_document_async
 from ..services.summary_pdf_generator import generate_summary_pdf
 from ..config import auth_disabled
 
 router = APIRouter()
 
-# Initialize services
-gemini_summarizer = GeminiSummarizer()
+# Initialize services (the Gemini summarizer is shared and created on first use)
 keyword_extractor = KeywordExtractor()
 
 # In-memory storage for job status (in production, use Redis or database)
@@ -68,11 +67,11 @@ async def upload_pdf_gemini(file: UploadFile = File(...)):
     
     try:
         # Extract keywords from raw text
-        raw_text = parse_document(file.filename, content)
-        keywords = keyword_extractor.extract(raw_text)
+        raw_text = await parse_document_async(file.filename, content)
+        keywords = await asyncio.to_thread(keyword_extractor.extract, raw_text)
         
         # Process with Gemini
-        result = await gemini_summarizer.summarize_pdf(file.filename, content)
+        result = await get_gemini_summarizer().summarize_pdf(file.filename, content, raw_text=raw_text)
         
         # Format tables for response
         tables_data = []
@@ -172,7 +171,7 @@ async def process_pdf_async(job_id: str, filename: str, content: bytes):
         job.message = "Analyzing document structure..."
         
         # Process with Gemini
-        result = await gemini_summarizer.summarize_pdf(filename, content)
+        result = await get_gemini_summarizer().summarize_pdf(filename, content)
         
         # Update job with result
         job.status = "completed"
@@ -236,12 +235,8 @@ async def health_check():
     try:
         # Test Gemini connection
         test_prompt = "Hello, this is a health check."
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            gemini_summarizer.executor,
-            gemini_summarizer.model.generate_content,
-            test_prompt
-        )
+        gemini_summarizer = get_gemini_summarizer()
+        response = await gemini_summarizer.model.generate_content_async(test_prompt)
         
         return {
             "status": "healthy",
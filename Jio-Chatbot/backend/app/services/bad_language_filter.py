@@ -1,6 +1,17 @@
 import json
+import re
 from pathlib import Path
 
+# Potentially harmful markup/script patterns in user input, combined into one case-insensitive scan
+HARMFUL_PATTERN_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in [
+    r'<script[^>]*>.*?</script>',  # Script tags
+    r'javascript:',  # JavaScript protocol
+    r'data:text/html',  # Data URLs
+    r'vbscript:',  # VBScript protocol
+    r'<iframe[^>]*>',  # Iframe tags
+    r'on\w+\s*=',  # Event handlers
+]), re.IGNORECASE)
+
 
 class BadLanguageFilter:
     def __init__(self) -> None:
@@ -10,9 +21,13 @@ class BadLanguageFilter:
                 self.bad_words: set[str] = set(json.load(f))
         else:
             self.bad_words = set()
+        # All words in one alternation so a message is scanned once
+        self._bad_words_re = (
+            re.compile("|".join(re.escape(bad) for bad in sorted(self.bad_words)))
+            if self.bad_words else None
+        )
 
     def contains_bad_language(self, text: str) -> bool:
-        lower = text.lower()
-        return any(bad in lower for bad in self.bad_words)
-
-
+        if self._bad_words_re is None:
+            return False
+        return self._bad_words_re.search(text.lower()) is not None
@@ -18,6 +18,9 @@ import io
 # Import company configuration
 from ..config import get_company_config
 
+# Built once; the generators only read 'Normal' from it as a parent style
+_SAMPLE_STYLES = getSampleStyleSheet()
+
 
 def get_company_logo():
     """Generate a professional company logo using ReportLab with configurable company name"""
@@ -204,7 +207,7 @@ def generate_bonafide_pdf(employee: dict, organization_name: str) -> bytes:
 
     # Create story (content) for the document
     story = []
-    styles = getSampleStyleSheet()
+    styles = _SAMPLE_STYLES
     
     # Enhanced border and watermark function with company logos and security elements
     def add_enhanced_border_and_watermark(canvas, doc):
@@ -614,7 +617,7 @@ def generate_experience_certificate(employee: dict, organization_name: str) -> b
     width, height = A4
 
     story = []
-    styles = getSampleStyleSheet()
+    styles = _SAMPLE_STYLES
     
     # Reuse the same border function
     def add_enhanced_border_and_watermark(canvas, doc):
@@ -919,7 +922,7 @@ def generate_offer_letter(employee: dict, organization_name: str) -> bytes:
     width, height = A4
 
     story = []
-    styles = getSampleStyleSheet()
+    styles = _SAMPLE_STYLES
     
     # Reuse the same border function
     def add_enhanced_border_and_watermark(canvas, doc):
@@ -1210,7 +1213,7 @@ def generate_salary_certificate(employee: dict, organization_name: str) -> bytes
     width, height = A4
 
     story = []
-    styles = getSampleStyleSheet()
+    styles = _SAMPLE_STYLES
     
     # Reuse the same border function
     def add_enhanced_border_and_watermark(canvas, doc):
@@ -8,6 +8,32 @@ from ..config import get_mongodb_uri
 
 logger = logging.getLogger(__name__)
 
+# Local JSON fallbacks go through orjson when it is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _read_json(path: str):
+    """Load a local JSON data file"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data) -> None:
+    """Write a local JSON data file (2-space indent, UTF-8 kept as-is)"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
 class DatabaseService:
     def __init__(self):
         self.client = None
@@ -71,8 +97,7 @@ class DatabaseService:
         """Load employees from JSON file to MongoDB"""
         try:
             json_file = os.path.join(os.path.dirname(__file__), "..", "data", "employees.json")
-            with open(json_file, 'r', encoding='utf-8') as f:
-                employees = json.load(f)
+            employees = _read_json(json_file)
             
             if employees:
                 await self.employees_collection.insert_many(employees)
@@ -84,8 +109,7 @@ class DatabaseService:
         """Load QA dataset from JSON file to MongoDB"""
         try:
             json_file = os.path.join(os.path.dirname(__file__), "..", "data", "qa_dataset.json")
-            with open(json_file, 'r', encoding='utf-8') as f:
-                qa_data = json.load(f)
+            qa_data = _read_json(json_file)
             
             if qa_data:
                 await self.qa_collection.insert_many(qa_data)
@@ -97,8 +121,7 @@ class DatabaseService:
         """Load bad words from JSON file to MongoDB"""
         try:
             json_file = os.path.join(os.path.dirname(__file__), "..", "data", "bad_words.json")
-            with open(json_file, 'r', encoding='utf-8') as f:
-                bad_words = json.load(f)
+            bad_words = _read_json(json_file)
             
             if bad_words:
                 await self.bad_words_collection.insert_many(bad_words)
@@ -140,8 +163,7 @@ class DatabaseService:
         # Fallback to local JSON file
         try:
             json_file = os.path.join(os.path.dirname(__file__), "..", "data", "employees.json")
-            with open(json_file, 'r', encoding='utf-8') as f:
-                employees = json.load(f)
+            employees = _read_json(json_file)
             
             for employee in employees:
                 if employee.get("emp_id") == emp_id:
@@ -161,8 +183,7 @@ class DatabaseService:
         """Get all QA pairs from local JSON file"""
         try:
             json_file = os.path.join(os.path.dirname(__file__), "..", "data", "qa_dataset.json")
-            with open(json_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _read_json(json_file)
         except Exception as e:
             logger.error(f"❌ Failed to load QA dataset from JSON: {str(e)}")
             return []
@@ -171,13 +192,11 @@ class DatabaseService:
         """Add new QA pair to local JSON file"""
         try:
             json_file = os.path.join(os.path.dirname(__file__), "..", "data", "qa_dataset.json")
-            with open(json_file, 'r', encoding='utf-8') as f:
-                qa_data = json.load(f)
+            qa_data = _read_json(json_file)
             
             qa_data.append({"question": question, "answer": answer})
             
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(qa_data, f, indent=2, ensure_ascii=False)
+            _write_json(json_file, qa_data)
                 
             logger.info("✅ Added new QA pair to local JSON file")
         except Exception as e:
@@ -189,15 +208,13 @@ class DatabaseService:
         try:
             json_file = os.path.join(os.path.dirname(__file__), "..", "data", "document_requests.json")
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    requests = json.load(f)
+                requests = _read_json(json_file)
             except FileNotFoundError:
                 requests = []
             
             requests.append(request_data)
             
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(requests, f, indent=2, ensure_ascii=False)
+            _write_json(json_file, requests)
                 
             logger.info("✅ Document request saved to local JSON file")
         except Exception as e:
@@ -207,8 +224,7 @@ class DatabaseService:
         """Get all document requests from local JSON file"""
         try:
             json_file = os.path.join(os.path.dirname(__file__), "..", "data", "document_requests.json")
-            with open(json_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _read_json(json_file)
         except FileNotFoundError:
             return []
         except Exception as e:
@@ -220,8 +236,7 @@ class DatabaseService:
         """Get all bad words from local JSON file"""
         try:
             json_file = os.path.join(os.path.dirname(__file__), "..", "data", "bad_words.json")
-            with open(json_file, 'r', encoding='utf-8') as f:
-                bad_words_data = json.load(f)
+            bad_words_data = _read_json(json_file)
             return [word["word"] for word in bad_words_data]
         except Exception as e:
             logger.error(f"❌ Failed to load bad words from JSON: {str(e)}")
@@ -2,6 +2,10 @@ from __future__ import annotations
 
 import os
 import io
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 import pdfplumber
 import fitz  # PyMuPDF
@@ -26,6 +30,30 @@ def parse_document(filename: str, content: bytes) -> str:
     raise ValueError(f"Unsupported file type: {suffix}")
 
 
+@lru_cache(maxsize=1)
+def _get_parse_pool() -> ProcessPoolExecutor:
+    # pdfplumber/OCR are CPU-bound and hold the GIL, so threads do not run them in parallel.
+    # Workers are spawned rather than forked from a server process that already runs threads
+    # and has torch loaded, and kept few since every uvicorn worker gets its own pool.
+    max_workers = max(1, min(int(os.getenv("DOC_PARSE_WORKERS", "2")), os.cpu_count() or 1))
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the parse worker processes, if the pool was ever started"""
+    if _get_parse_pool.cache_info().currsize:
+        _get_parse_pool().shutdown(wait=False, cancel_futures=True)
+        _get_parse_pool.cache_clear()
+
+
+async def parse_document_async(filename: str, content: bytes) -> str:
+    """parse_document in the worker process pool, without blocking the event loop"""
+    if Path(filename).suffix.lower() in {".txt", ""}:
+        return parse_document(filename, content)  # Plain decode, not worth the pickling
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_parse_pool(), parse_document, filename, content)
+
+
 def _parse_pdf(content: bytes) -> str:
     text_parts: list[str] = []
     try:
@@ -92,7 +120,7 @@ def _parse_pdf(content: bytes) -> str:
         text_parts.append("\n".join(table_text_parts))
         
     # If still too little text, try OCR for scanned PDFs with guardrails
-    if len("".join(text_parts).strip()) < 50:
+    if _stripped_length(text_parts) < 50:
         ocr_enabled = os.getenv("OCR_ENABLED", "true").strip().lower() in {"1", "true", "yes"}
         if ocr_enabled:
             dpi = int(os.getenv("OCR_DPI", "200"))
@@ -119,6 +147,26 @@ def _parse_pdf(content: bytes) -> str:
     return "\n".join(text_parts)
 
 
+def _stripped_length(parts: list[str]) -> int:
+    """len("".join(parts).strip()) without building the joined document"""
+    total = sum(map(len, parts))
+    leading = 0
+    for part in parts:
+        rest = part.lstrip()
+        leading += len(part) - len(rest)
+        if rest:
+            break
+    else:
+        return 0  # Whitespace only
+    trailing = 0
+    for part in reversed(parts):
+        rest = part.rstrip()
+        trailing += len(part) - len(rest)
+        if rest:
+            break
+    return total - leading - trailing
+
+
 def _parse_docx(content: bytes) -> str:
     bio = io.BytesIO(content)
     doc = Document(bio)
@@ -1,6 +1,8 @@
 import os
+import re
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -11,10 +13,41 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
 import io
+import queue
+import threading
 
-from .employee_validator import EmployeeValidator
+from .employee_validator import get_employee_validator
 from ..config import get_company_config
 
+# Initial size of pooled PDF output buffers (typical generated documents are 30-60 KB)
+PDF_BUFFER_SIZE = 64 * 1024
+
+# Employee date fields rendered in generated documents
+DATE_FIELDS = ('joining_date', 'relieving_date', 'appointment_date', 'promotion_date', 'travel_date')
+
+# Free-text details fallback: employee code and any line mentioning a name
+_EMPLOYEE_ID_RE = re.compile(r'emp[0-9]+')
+_NAME_LINE_RE = re.compile(r'^.*name.*$', re.IGNORECASE | re.MULTILINE)
+
+
+@lru_cache(maxsize=1024)
+def _normalize_date(date_str: str) -> str:
+    """Normalize a non-empty date string to DD-MM-YYYY (cached per distinct value)"""
+    try:
+        # Handle different date formats
+        if '-' in date_str:
+            if len(date_str.split('-')[0]) == 4:  # YYYY-MM-DD
+                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+            else:  # DD-MM-YYYY
+                date_obj = datetime.strptime(date_str, '%d-%m-%Y')
+        elif '/' in date_str:
+            date_obj = datetime.strptime(date_str, '%d/%m/%Y')
+        else:
+            return date_str
+        return date_obj.strftime('%d-%m-%Y')
+    except:
+        return date_str
+
 # Enhanced helper functions for premium design - Fixed to avoid image processing issues
 def get_company_logo():
     """Generate a professional company logo using ReportLab - Fixed version"""
@@ -45,10 +78,15 @@ class DocumentPDFGenerator:
     """Enhanced PDF Generator for all document types with professional design"""
     
     def __init__(self):
-        self.employee_validator = EmployeeValidator()
+        self.employee_validator = get_employee_validator()
         self.styles = getSampleStyleSheet()
         self.setup_enhanced_styles()
         
+        # Pre-sized output buffers reused across generations
+        self._buffer_pool: queue.SimpleQueue = queue.SimpleQueue()
+        # The singleton is shared by request worker threads; render one document at a time
+        self._render_lock = threading.Lock()
+        
         # Company details (using configurable company details)
         self.company_config = get_company_config()
         self.company_name = self.company_config['name']
@@ -56,6 +94,8 @@ class DocumentPDFGenerator:
         self.company_email = self.company_config['email']
         self.company_phone = self.company_config['phone']
         self.company_website = self.company_config['website']
+        # Dynamic prefix from company name initials (e.g., TechCorp Solutions -> TCS)
+        self.reference_prefix = ''.join([w[0] for w in self.company_name.split() if w and w[0].isalnum()])[:6].upper() or 'DOC'
         
         # Document templates
         self.document_templates = {
@@ -211,7 +251,8 @@ class DocumentPDFGenerator:
             
             # Generate PDF based on document type
             if doc_type in self.document_templates:
-                pdf_bytes = self.document_templates[doc_type](doc_name, employee_info, details)
+                with self._render_lock:
+                    pdf_bytes = self.document_templates[doc_type](doc_name, employee_info, details)
                 if not pdf_bytes or len(pdf_bytes) == 0:
                     raise ValueError("Generated PDF is empty")
                 return pdf_bytes
@@ -227,6 +268,24 @@ class DocumentPDFGenerator:
                 # Return a minimal error PDF
                 return self._generate_minimal_error_document(doc_name, str(e))
 
+    def _acquire_buffer(self) -> io.BytesIO:
+        """Get a pre-sized output buffer from the pool"""
+        try:
+            buffer = self._buffer_pool.get_nowait()
+        except queue.Empty:
+            buffer = io.BytesIO(bytes(PDF_BUFFER_SIZE))
+        # Rewind without truncating so the buffer keeps its allocated capacity
+        buffer.seek(0)
+        return buffer
+
+    def _release_buffer(self, buffer: io.BytesIO) -> bytes:
+        """Copy the written PDF out of a pooled buffer and return the buffer to the pool"""
+        size = buffer.tell()
+        with buffer.getbuffer() as view:
+            pdf_bytes = bytes(view[:size])
+        self._buffer_pool.put(buffer)
+        return pdf_bytes
+
     def _parse_employee_details(self, details: str) -> Dict:
         """Parse employee details from text or JSON with enhanced error handling"""
         employee_info = {}
@@ -265,15 +324,13 @@ class DocumentPDFGenerator:
             # Fallback to text parsing
             details_lower = details.lower()
             if "employee id" in details_lower or "emp" in details_lower:
-                import re
-                emp_match = re.search(r'emp[0-9]+', details_lower)
+                emp_match = _EMPLOYEE_ID_RE.search(details_lower)
                 if emp_match: employee_info['employee_id'] = emp_match.group().upper()
             if "name" in details_lower:
-                lines = details.split('\n')
-                for line in lines:
-                    if "name" in line.lower():
-                        name_part = line.split(':')[-1].strip()
-                        if name_part: employee_info['full_name'] = name_part
+                # One scan for the name lines; the last non-empty value wins
+                for line in _NAME_LINE_RE.findall(details):
+                    name_part = line.split(':')[-1].strip()
+                    if name_part: employee_info['full_name'] = name_part
             
             # Set defaults for missing fields
             if not employee_info.get('full_name'): employee_info['full_name'] = 'Employee Name'
@@ -285,7 +342,7 @@ class DocumentPDFGenerator:
 
     def _generate_error_document(self, doc_name: str, error: str) -> bytes:
         """Generate error document when PDF generation fails"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, 
                               topMargin=2*cm, bottomMargin=2*cm)
         
@@ -305,12 +362,11 @@ class DocumentPDFGenerator:
         self._add_enhanced_footer(story)
         
         doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
 
     def _generate_minimal_error_document(self, doc_name: str, error: str) -> bytes:
         """Generate minimal error document when even error document generation fails"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, 
                               topMargin=2*cm, bottomMargin=2*cm)
         
@@ -324,8 +380,7 @@ class DocumentPDFGenerator:
         story.append(Paragraph("Please contact HR department for assistance.", self.normal_style))
         
         doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
 
     def _add_enhanced_company_header(self, story: List):
         """Add enhanced company header with logo and professional styling"""
@@ -363,6 +418,7 @@ class DocumentPDFGenerator:
 
     def _add_signature_section(self, story: List, signatory_name: str, designation: str):
         """Add enhanced signature section with digital signatures"""
+        signing_date = datetime.now().strftime('%d-%m-%Y')
         story.append(Spacer(1, 20))
         story.append(Paragraph("✍️ Authorized Digital Signatures:", self.section_heading_style))
         story.append(Spacer(1, 10))
@@ -381,8 +437,8 @@ class DocumentPDFGenerator:
         ]))
         
         # Add text-based signatures instead of images
-        sig1_text = Paragraph(f"<b>{signatory_name}</b><br/>{designation}<br/>Date: {datetime.now().strftime('%d-%m-%Y')}", self.normal_style)
-        sig2_text = Paragraph(f"<b>Priya Sharma</b><br/>Senior HR Manager<br/>Date: {datetime.now().strftime('%d-%m-%Y')}", self.normal_style)
+        sig1_text = Paragraph(f"<b>{signatory_name}</b><br/>{designation}<br/>Date: {signing_date}", self.normal_style)
+        sig2_text = Paragraph(f"<b>Priya Sharma</b><br/>Senior HR Manager<br/>Date: {signing_date}", self.normal_style)
         
         # Replace table cells with text signatures
         signature_table._argW[0] = 3*inch
@@ -397,20 +453,18 @@ class DocumentPDFGenerator:
         """Format date string to professional format"""
         if not date_str:
             return datetime.now().strftime('%d-%m-%Y')
-        try:
-            # Handle different date formats
-            if '-' in date_str:
-                if len(date_str.split('-')[0]) == 4:  # YYYY-MM-DD
-                    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                else:  # DD-MM-YYYY
-                    date_obj = datetime.strptime(date_str, '%d-%m-%Y')
-            elif '/' in date_str:
-                date_obj = datetime.strptime(date_str, '%d/%m/%Y')
-            else:
-                return date_str
-            return date_obj.strftime('%d-%m-%Y')
-        except:
+        if not isinstance(date_str, str):
             return date_str
+        return _normalize_date(date_str)
+
+    def _parse_all_dates(self, employee_info: Dict) -> Dict[str, str]:
+        """Format every employee date field once for a document"""
+        today = datetime.now().strftime('%d-%m-%Y')
+        dates = {}
+        for field in DATE_FIELDS:
+            value = employee_info.get(field, '')
+            dates[field] = self._format_date(value) if value else today
+        return dates
 
     def add_enhanced_border_and_watermark(self, canvas, doc):
         """Add enhanced border and watermark to the document"""
@@ -441,10 +495,7 @@ class DocumentPDFGenerator:
         # QR Code text (instead of image)
         canvas.setFillColor(colors.HexColor('#1e40af'))
         canvas.setFont("Helvetica-Bold", 6)
-        # Dynamic prefix from company name initials (e.g., TechCorp Solutions -> TCS)
-        from ..config import get_company_name
-        _cn = get_company_name()
-        _prefix = ''.join([w[0] for w in _cn.split() if w and w[0].isalnum()])[:6].upper() or 'DOC'
+        _prefix = self.reference_prefix
         canvas.drawString(0.2*inch, 0.2*inch, f"{_prefix}-{datetime.now().strftime('%Y%m%d%H%M%S')}")
         
         # Page number
@@ -464,7 +515,7 @@ class DocumentPDFGenerator:
 
     def generate_bonafide_letter(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional bonafide letter with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -478,9 +529,7 @@ class DocumentPDFGenerator:
         
         # Reference Number - Issue date should be current date when document is generated
         current_issue_date, formatted_issue_date = self._get_current_issue_date()
-        from ..config import get_company_name
-        _cn = get_company_name()
-        _prefix = ''.join([w[0] for w in _cn.split() if w and w[0].isalnum()])[:6].upper() or 'DOC'
+        _prefix = self.reference_prefix
         ref_number = f"Reference No: {_prefix}-BON-{employee_info.get('employee_id', '')}-{current_issue_date.replace('-', '')}"
         story.append(Paragraph(ref_number, self.reference_style))
         story.append(Spacer(1, 5))
@@ -493,7 +542,8 @@ class DocumentPDFGenerator:
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
         purpose = employee_info.get('purpose', 'Official purposes')
         
         # Main Certificate Text
@@ -559,12 +609,11 @@ The information provided herein is true and accurate to the best of our knowledg
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
 
     def generate_experience_certificate(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional experience certificate with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -580,9 +629,7 @@ The information provided herein is true and accurate to the best of our knowledg
         current_issue_date, formatted_issue_date = self._get_current_issue_date()
         relieving_date = employee_info.get('relieving_date', '')
         formatted_relieving_date = self._format_date(relieving_date)
-        from ..config import get_company_name
-        _cn = get_company_name()
-        _prefix = ''.join([w[0] for w in _cn.split() if w and w[0].isalnum()])[:6].upper() or 'DOC'
+        _prefix = self.reference_prefix
         ref_number = f"Reference No: {_prefix}-EXP-{employee_info.get('employee_id', '')}-{current_issue_date.replace('-', '')}"
         story.append(Paragraph(ref_number, self.reference_style))
         story.append(Spacer(1, 5))
@@ -595,8 +642,9 @@ The information provided herein is true and accurate to the best of our knowledg
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
-        relieving_date = self._format_date(employee_info.get('relieving_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
+        relieving_date = dates['relieving_date']
         
         # Main Certificate Text
         cert_text_1 = f"""
@@ -667,8 +715,7 @@ This certificate is issued for official purposes and confirms the employment det
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
 
     def _calculate_experience(self, joining_date: str, relieving_date: str) -> str:
         """Calculate total experience duration"""
@@ -691,7 +738,7 @@ This certificate is issued for official purposes and confirms the employment det
 
     def generate_salary_certificate(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional salary certificate with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -705,9 +752,7 @@ This certificate is issued for official purposes and confirms the employment det
         
         # Reference Number - Issue date should be current date when document is generated
         current_issue_date, formatted_issue_date = self._get_current_issue_date()
-        from ..config import get_company_name
-        _cn = get_company_name()
-        _prefix = ''.join([w[0] for w in _cn.split() if w and w[0].isalnum()])[:6].upper() or 'DOC'
+        _prefix = self.reference_prefix
         ref_number = f"Reference No: {_prefix}-SAL-{employee_info.get('employee_id', '')}-{current_issue_date.replace('-', '')}"
         story.append(Paragraph(ref_number, self.reference_style))
         story.append(Spacer(1, 5))
@@ -720,7 +765,8 @@ This certificate is issued for official purposes and confirms the employment det
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
         salary_amount = employee_info.get('salary_amount', '')
         purpose = employee_info.get('purpose', 'Official purposes')
         
@@ -795,12 +841,11 @@ The employee's salary is subject to applicable taxes and deductions as per the I
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
 
     def generate_noc_letter(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional NOC letter with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -814,9 +859,7 @@ The employee's salary is subject to applicable taxes and deductions as per the I
         
         # Reference Number - Issue date should be current date when document is generated
         current_issue_date, formatted_issue_date = self._get_current_issue_date()
-        from ..config import get_company_name
-        _cn = get_company_name()
-        _prefix = ''.join([w[0] for w in _cn.split() if w and w[0].isalnum()])[:6].upper() or 'DOC'
+        _prefix = self.reference_prefix
         ref_number = f"Reference No: {_prefix}-NOC-{employee_info.get('employee_id', '')}-{current_issue_date.replace('-', '')}"
         story.append(Paragraph(ref_number, self.reference_style))
         story.append(Spacer(1, 5))
@@ -829,8 +872,9 @@ The employee's salary is subject to applicable taxes and deductions as per the I
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
-        relieving_date = self._format_date(employee_info.get('relieving_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
+        relieving_date = dates['relieving_date']
         purpose = employee_info.get('purpose', 'Official purposes')
         
         # Main Certificate Text
@@ -903,12 +947,11 @@ This NOC is issued for official purposes and confirms that there are no pending
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
 
     def generate_visa_support_letter(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional visa support letter with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -922,9 +965,7 @@ This NOC is issued for official purposes and confirms that there are no pending
         
         # Reference Number - Issue date should be current date when document is generated
         current_issue_date, formatted_issue_date = self._get_current_issue_date()
-        from ..config import get_company_name
-        _cn = get_company_name()
-        _prefix = ''.join([w[0] for w in _cn.split() if w and w[0].isalnum()])[:6].upper() or 'DOC'
+        _prefix = self.reference_prefix
         ref_number = f"Reference No: {_prefix}-VISA-{employee_info.get('employee_id', '')}-{current_issue_date.replace('-', '')}"
         story.append(Paragraph(ref_number, self.reference_style))
         story.append(Spacer(1, 5))
@@ -937,7 +978,8 @@ This NOC is issued for official purposes and confirms that there are no pending
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
         salary_amount = employee_info.get('salary_amount', '')
         purpose = employee_info.get('purpose', 'Business travel')
         
@@ -1011,12 +1053,11 @@ This visa support letter is issued for official purposes and confirms the employ
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
 
     def generate_offer_letter(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional offer letter with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -1030,9 +1071,7 @@ This visa support letter is issued for official purposes and confirms the employ
         
         # Reference Number - Issue date should be current date when document is generated
         current_issue_date, formatted_issue_date = self._get_current_issue_date()
-        from ..config import get_company_name
-        _cn = get_company_name()
-        _prefix = ''.join([w[0] for w in _cn.split() if w and w[0].isalnum()])[:6].upper() or 'DOC'
+        _prefix = self.reference_prefix
         ref_number = f"Reference No: {_prefix}-OFF-{employee_info.get('employee_id', '')}-{current_issue_date.replace('-', '')}"
         story.append(Paragraph(ref_number, self.reference_style))
         story.append(Spacer(1, 5))
@@ -1045,9 +1084,10 @@ This visa support letter is issued for official purposes and confirms the employ
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
         salary_amount = employee_info.get('salary_amount', '')
-        appointment_date = self._format_date(employee_info.get('appointment_date', ''))
+        appointment_date = dates['appointment_date']
         
         # Main Offer Letter Text
         offer_text_1 = f"""
@@ -1136,12 +1176,11 @@ Please confirm your acceptance of this offer by signing and returning a copy of
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
 
     def generate_appointment_letter(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional appointment letter with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -1156,9 +1195,7 @@ Please confirm your acceptance of this offer by signing and returning a copy of
         # Reference Number
         appointment_date = employee_info.get('appointment_date', datetime.now().strftime('%Y-%m-%d'))
         formatted_date = self._format_date(appointment_date)
-        from ..config import get_company_name
-        _cn = get_company_name()
-        _prefix = ''.join([w[0] for w in _cn.split() if w and w[0].isalnum()])[:6].upper() or 'DOC'
+        _prefix = self.reference_prefix
         ref_number = f"Reference No: {_prefix}-APT-{employee_info.get('employee_id', '')}-{appointment_date.replace('-', '')}"
         story.append(Paragraph(ref_number, self.reference_style))
         story.append(Spacer(1, 5))
@@ -1171,8 +1208,9 @@ Please confirm your acceptance of this offer by signing and returning a copy of
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
-        appointment_date = self._format_date(employee_info.get('appointment_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
+        appointment_date = dates['appointment_date']
         salary_amount = employee_info.get('salary_amount', '')
         
         # Main Appointment Letter Text
@@ -1262,12 +1300,11 @@ We welcome you to the {self.company_name} family and look forward to a long and
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
 
     def generate_promotion_letter(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional promotion letter with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -1282,9 +1319,7 @@ We welcome you to the {self.company_name} family and look forward to a long and
         # Reference Number
         promotion_date = employee_info.get('promotion_date', datetime.now().strftime('%Y-%m-%d'))
         formatted_date = self._format_date(promotion_date)
-        from ..config import get_company_name
-        _cn = get_company_name()
-        _prefix = ''.join([w[0] for w in _cn.split() if w and w[0].isalnum()])[:6].upper() or 'DOC'
+        _prefix = self.reference_prefix
         ref_number = f"Reference No: {_prefix}-PR-{employee_info.get('employee_id', '')}-{promotion_date.replace('-', '')}"
         story.append(Paragraph(ref_number, self.reference_style))
         story.append(Spacer(1, 5))
@@ -1297,9 +1332,10 @@ We welcome you to the {self.company_name} family and look forward to a long and
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
         salary_amount = employee_info.get('salary_amount', '')
-        promotion_date = self._format_date(employee_info.get('promotion_date', ''))
+        promotion_date = dates['promotion_date']
         
         # Promotion Letter Content
         promotion_text_1 = f"""
@@ -1393,12 +1429,11 @@ We congratulate you on this well-deserved promotion and look forward to your con
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
     
     def generate_relieving_letter(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional relieving letter with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -1413,9 +1448,7 @@ We congratulate you on this well-deserved promotion and look forward to your con
         # Reference Number
         relieving_date = employee_info.get('relieving_date', datetime.now().strftime('%Y-%m-%d'))
         formatted_date = self._format_date(relieving_date)
-        from ..config import get_company_name
-        _cn = get_company_name()
-        _prefix = ''.join([w[0] for w in _cn.split() if w and w[0].isalnum()])[:6].upper() or 'DOC'
+        _prefix = self.reference_prefix
         ref_number = f"Reference No: {_prefix}-RL-{employee_info.get('employee_id', '')}-{relieving_date.replace('-', '')}"
         story.append(Paragraph(ref_number, self.reference_style))
         story.append(Spacer(1, 5))
@@ -1428,8 +1461,9 @@ We congratulate you on this well-deserved promotion and look forward to your con
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
-        relieving_date = self._format_date(employee_info.get('relieving_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
+        relieving_date = dates['relieving_date']
         
         # Relieving Letter Content
         relieving_text_1 = f"""
@@ -1522,12 +1556,11 @@ We wish you success in your future endeavors and thank you for your contribution
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
     
     def generate_salary_slip(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional salary slip with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -1541,9 +1574,7 @@ We wish you success in your future endeavors and thank you for your contribution
         
         # Reference Number - Issue date should be current date when document is generated
         current_issue_date, formatted_issue_date = self._get_current_issue_date()
-        from ..config import get_company_name
-        _cn = get_company_name()
-        _prefix = ''.join([w[0] for w in _cn.split() if w and w[0].isalnum()])[:6].upper() or 'DOC'
+        _prefix = self.reference_prefix
         ref_number = f"Reference No: {_prefix}-SL-{employee_info.get('employee_id', '')}-{current_issue_date.replace('-', '')}"
         story.append(Paragraph(ref_number, self.reference_style))
         story.append(Spacer(1, 5))
@@ -1556,8 +1587,9 @@ We wish you success in your future endeavors and thank you for your contribution
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
-        relieving_date = self._format_date(employee_info.get('relieving_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
+        relieving_date = dates['relieving_date']
         salary_amount = employee_info.get('salary_amount', '')
         
         # Salary Slip Content
@@ -1656,12 +1688,11 @@ This is to certify that you have been paid a salary of <b>₹{salary_amount}</b>
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
     
     def generate_form_16(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional Form 16 with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -1687,8 +1718,9 @@ This is to certify that you have been paid a salary of <b>₹{salary_amount}</b>
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
-        relieving_date = self._format_date(employee_info.get('relieving_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
+        relieving_date = dates['relieving_date']
         assessment_year = formatted_issue_date.split('-')[2]
         
         # Form 16 Content
@@ -1783,12 +1815,11 @@ This is to certify that you have been issued Form 16 for the assessment year <b>
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
     
     def generate_pf_statement(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional PF statement with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -1814,8 +1845,9 @@ This is to certify that you have been issued Form 16 for the assessment year <b>
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
-        relieving_date = self._format_date(employee_info.get('relieving_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
+        relieving_date = dates['relieving_date']
         
         # PF Statement Content
         pf_statement_text_1 = f"""
@@ -1908,12 +1940,11 @@ This is to certify that you have been issued a Provident Fund (PF) Statement for
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
     
     def generate_nda_copy(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional NDA copy with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -1939,8 +1970,9 @@ This is to certify that you have been issued a Provident Fund (PF) Statement for
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
-        relieving_date = self._format_date(employee_info.get('relieving_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
+        relieving_date = dates['relieving_date']
         
         # NDA Copy Content
         nda_copy_text_1 = f"""
@@ -2033,12 +2065,11 @@ This is to certify that you have been issued a Non-Disclosure Agreement (NDA) co
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
     
     def generate_id_card_replacement(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional ID card replacement request with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -2064,7 +2095,8 @@ This is to certify that you have been issued a Non-Disclosure Agreement (NDA) co
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
         reason = employee_info.get('reason', 'Lost/Damaged')
         
         # ID Card Replacement Content
@@ -2159,12 +2191,11 @@ This is to confirm that your request for ID card replacement has been received a
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
     
     def generate_medical_insurance_card(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional medical insurance card copy with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -2190,7 +2221,8 @@ This is to confirm that your request for ID card replacement has been received a
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
         
         # Medical Insurance Card Content
         med_card_text_1 = f"""
@@ -2285,12 +2317,11 @@ This is to certify that you have been issued a Medical Insurance Card copy from
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
     
     def generate_travel_authorization(self, doc_name: str, employee_info: Dict, details: str) -> bytes:
         """Generate professional business travel authorization letter with enhanced design"""
-        buffer = io.BytesIO()
+        buffer = self._acquire_buffer()
         doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=1.2*inch, rightMargin=1.2*inch, 
                               topMargin=1.0*inch, bottomMargin=1.0*inch)
         
@@ -2316,11 +2347,12 @@ This is to certify that you have been issued a Medical Insurance Card copy from
         employee_id = employee_info.get('employee_id', '')  # Use actual employee ID from form
         designation = employee_info.get('designation', '')
         department = employee_info.get('department', '')
-        joining_date = self._format_date(employee_info.get('joining_date', ''))
+        dates = self._parse_all_dates(employee_info)
+        joining_date = dates['joining_date']
         destination = employee_info.get('destination', '')
         purpose = employee_info.get('purpose', '')
         duration = employee_info.get('duration', '')
-        travel_date = self._format_date(employee_info.get('travel_date', ''))
+        travel_date = dates['travel_date']
         
         # Travel Authorization Content
         travel_auth_text_1 = f"""
@@ -2416,5 +2448,4 @@ This is to authorize your business travel to <b>{destination}</b> from <b>{self.
         # Build PDF with enhanced border
         doc.build(story, onFirstPage=self.add_enhanced_border_and_watermark, onLaterPages=self.add_enhanced_border_and_watermark)
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        return self._release_buffer(buffer)
@@ -1,12 +1,20 @@
 import json
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import os
+import threading
 
 from .document_pdf_generator import DocumentPDFGenerator
 
+# Read/write the request log with orjson when it is installed (it stores PDFs as hex, so it gets large)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class DocumentRequestHandler:
     """Handles document requests with step-by-step flow"""
     
@@ -31,8 +39,13 @@ class DocumentRequestHandler:
             "16": "Visa Support Letter"
         }
         
-        # Load existing requests
+        # Load existing requests (indexed by id for status lookups; first request wins on a clash)
         self.requests = self._load_requests()
+        self._requests_by_id: Dict[str, Dict] = {}
+        for request in self.requests:
+            self._requests_by_id.setdefault(request.get('id'), request)
+        # Submissions generate PDFs in worker threads; serialize updates to the request log
+        self._requests_lock = threading.Lock()
         
         # Initialize PDF generator
         self.pdf_generator = DocumentPDFGenerator()
@@ -40,6 +53,9 @@ class DocumentRequestHandler:
     def _load_requests(self) -> List[Dict]:
         """Load existing document requests"""
         try:
+            if orjson is not None:
+                with open(self.documents_file, 'rb') as f:
+                    return orjson.loads(f.read())
             with open(self.documents_file, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except FileNotFoundError:
@@ -47,6 +63,10 @@ class DocumentRequestHandler:
     
     def _save_requests(self):
         """Save document requests"""
+        if orjson is not None:
+            with open(self.documents_file, 'wb') as f:
+                f.write(orjson.dumps(self.requests, option=orjson.OPT_INDENT_2))
+            return
         with open(self.documents_file, 'w', encoding='utf-8') as f:
             json.dump(self.requests, f, indent=2, ensure_ascii=False)
     
@@ -95,44 +115,45 @@ class DocumentRequestHandler:
         # Add a note about chat-based requests
         base_prompt += "💡 **Note:** You can provide these details in a simple text format, or use our form-based system for a better experience.\n\n"
         
-        # Different prompts based on document type
-        if "bonafide" in doc_name.lower() or "employment verification" in doc_name.lower():
+        # Different prompts based on document type (name lowercased once for all checks)
+        name_lower = doc_name.lower()
+        if "bonafide" in name_lower or "employment verification" in name_lower:
             return base_prompt + "• Full Name\n• Employee ID\n• Purpose (e.g., bank loan, visa application, etc.)\n• Any specific requirements"
         
-        elif "experience" in doc_name.lower():
+        elif "experience" in name_lower:
             return base_prompt + "• Full Name\n• Employee ID\n• Date of joining\n• Date of leaving (if applicable)\n• Purpose"
         
-        elif "offer letter" in doc_name.lower():
+        elif "offer letter" in name_lower:
             return base_prompt + "• Full Name\n• Employee ID\n• Position/Designation\n• Department\n• Date of offer\n• Purpose of request"
         
-        elif "appointment letter" in doc_name.lower():
+        elif "appointment letter" in name_lower:
             return base_prompt + "• Full Name\n• Employee ID\n• Position/Designation\n• Department\n• Date of appointment\n• Purpose of request"
         
-        elif "salary" in doc_name.lower():
+        elif "salary" in name_lower:
             return base_prompt + "• Full Name\n• Employee ID\n• Time period (e.g., last 3 months, specific month)\n• Purpose"
         
-        elif "form 16" in doc_name.lower() or "tax" in doc_name.lower():
+        elif "form 16" in name_lower or "tax" in name_lower:
             return base_prompt + "• Full Name\n• Employee ID\n• Financial year (e.g., 2023-24)\n• Purpose"
         
-        elif "pf" in doc_name.lower() or "uan" in doc_name.lower():
+        elif "pf" in name_lower or "uan" in name_lower:
             return base_prompt + "• Full Name\n• Employee ID\n• UAN number (if known)\n• Purpose"
         
-        elif "noc" in doc_name.lower() or "no objection" in doc_name.lower():
+        elif "noc" in name_lower or "no objection" in name_lower:
             return base_prompt + "• Full Name\n• Employee ID\n• Purpose of NOC\n• Duration (if applicable)\n• Any specific conditions"
         
-        elif "id card" in doc_name.lower():
+        elif "id card" in name_lower:
             return base_prompt + "• Full Name\n• Employee ID\n• Reason for replacement (lost, damaged, etc.)\n• Date of incident (if applicable)"
         
-        elif "medical insurance" in doc_name.lower():
+        elif "medical insurance" in name_lower:
             return base_prompt + "• Full Name\n• Employee ID\n• Policy number (if known)\n• Purpose of request"
         
-        elif "travel authorization" in doc_name.lower():
+        elif "travel authorization" in name_lower:
             return base_prompt + "• Full Name\n• Employee ID\n• Destination\n• Purpose of travel\n• Travel dates\n• Duration of trip"
         
-        elif "visa" in doc_name.lower():
+        elif "visa" in name_lower:
             return base_prompt + "• Full Name\n• Employee ID\n• Destination country\n• Purpose of travel\n• Travel dates\n• Type of visa"
         
-        elif "travel" in doc_name.lower():
+        elif "travel" in name_lower:
             return base_prompt + "• Full Name\n• Employee ID\n• Destination\n• Purpose of travel\n• Travel dates\n• Estimated cost"
         
         else:
@@ -280,12 +301,15 @@ class DocumentRequestHandler:
                 "submitted_at": datetime.now().isoformat(),
                 "hr_notified": False,
                 "pdf_generated": True,
-                "pdf_content": pdf_content.hex() if isinstance(pdf_content, bytes) else pdf_content
+                "pdf_content": pdf_content.hex(),
+                "pdf_size": len(pdf_content)
             }
             
             # Add to requests list
-            self.requests.append(request)
-            self._save_requests()
+            with self._requests_lock:
+                self.requests.append(request)
+                self._requests_by_id.setdefault(request["id"], request)
+                self._save_requests()
             
             # Log for HR notification
             self._log_hr_notification(request)
@@ -310,8 +334,10 @@ class DocumentRequestHandler:
                 "error": str(e)
             }
             
-            self.requests.append(request)
-            self._save_requests()
+            with self._requests_lock:
+                self.requests.append(request)
+                self._requests_by_id.setdefault(request["id"], request)
+                self._save_requests()
             self._log_hr_notification(request)
             
             # Re-raise the exception to be handled by the caller
@@ -405,10 +431,7 @@ Contact HR at hr@reliancejio.com or call the HR helpline for assistance."""
             if not request_id or not isinstance(request_id, str):
                 return None
                 
-            for request in self.requests:
-                if request.get('id') == request_id:
-                    return request
-            return None
+            return self._requests_by_id.get(request_id)
         except Exception as e:
             print(f"Error getting request status: {str(e)}")
             return None
@@ -431,3 +454,9 @@ Contact HR at hr@reliancejio.com or call the HR helpline for assistance."""
         except Exception as e:
             print(f"Error getting pending requests count: {str(e)}")
             return 0
+
+
+@lru_cache(maxsize=1)
+def get_document_request_handler() -> DocumentRequestHandler:
+    """Get the shared DocumentRequestHandler so chat and the document router see one request log"""
+    return DocumentRequestHandler()
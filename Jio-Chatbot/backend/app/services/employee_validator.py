@@ -2,6 +2,7 @@ import json
 import os
 from typing import Dict, Optional, List
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -11,13 +12,24 @@ class EmployeeValidator:
     def __init__(self):
         self.employees_file = Path(__file__).parent.parent / "data" / "employees.json"
         self._employees_data = None
+        self._employees_mtime = None
+        # Lookup indexes built alongside the data
+        self._by_code: Dict[str, Dict] = {}
+        self._by_name: Dict[str, Dict] = {}
+        self._search_rows: List[tuple] = []
     
     def _load_employees_data(self) -> List[Dict]:
-        """Load employee data from JSON file with enhanced error handling"""
-        if self._employees_data is None:
+        """Load employee data from JSON file with enhanced error handling (reloaded when the file changes)"""
+        try:
+            mtime = self.employees_file.stat().st_mtime
+        except OSError:
+            mtime = None
+        if self._employees_data is None or mtime != self._employees_mtime:
             try:
-                if not self.employees_file.exists():
+                if mtime is None:
                     print(f"Warning: Employee data file not found at {self.employees_file}")
+                    self._build_indexes([])
+                    self._employees_data = None
                     return []
                 
                 with open(self.employees_file, 'r', encoding='utf-8') as f:
@@ -25,7 +37,9 @@ class EmployeeValidator:
                     if not isinstance(data, list):
                         print("Warning: Employee data file does not contain a list")
                         return []
+                    self._build_indexes(data)
                     self._employees_data = data
+                    self._employees_mtime = mtime
             except (FileNotFoundError, json.JSONDecodeError, PermissionError) as e:
                 print(f"Error loading employee data: {str(e)}")
                 return []
@@ -34,6 +48,24 @@ class EmployeeValidator:
                 return []
         return self._employees_data
     
+    def _build_indexes(self, employees: List[Dict]) -> None:
+        """Index employees by code and name, and pre-lowercase the search fields"""
+        by_code = {}
+        by_name = {}
+        search_rows = []
+        for emp in employees:
+            if not emp or not isinstance(emp, dict):
+                continue
+            code = str(emp.get('employee_code', '')).strip()
+            name = str(emp.get('full_name', '')).strip()
+            # Keep the first record for duplicate keys, as the linear scans did
+            by_code.setdefault(code.upper(), emp)
+            by_name.setdefault(name.lower(), emp)
+            search_rows.append((str(emp.get('full_name', '')).lower(), code.lower(), emp))
+        self._by_code = by_code
+        self._by_name = by_name
+        self._search_rows = search_rows
+    
     def validate_employee(self, employee_data: Dict) -> Dict:
         """
         Validate employee data against existing records - ALL fields must match exactly
@@ -45,7 +77,7 @@ class EmployeeValidator:
             Dict with validation result and details
         """
         try:
-            employees = self._load_employees_data()
+            self._load_employees_data()
             
             # Validate input
             if not employee_data or not isinstance(employee_data, dict):
@@ -85,20 +117,18 @@ class EmployeeValidator:
             
             # Find employee by ID first (most reliable)
             if employee_id:
-                for emp in employees:
-                    if emp and isinstance(emp, dict) and emp.get('employee_code', '').strip().upper() == employee_id.upper():
-                        validation_result['employee_found'] = True
-                        validation_result['matched_employee'] = emp
-                        break
+                emp = self._by_code.get(employee_id.upper())
+                if emp is not None:
+                    validation_result['employee_found'] = True
+                    validation_result['matched_employee'] = emp
             
             # If not found by ID, try by name
             if not validation_result['employee_found'] and employee_name:
-                for emp in employees:
-                    if emp and isinstance(emp, dict) and emp.get('full_name', '').strip().lower() == employee_name.lower():
-                        validation_result['employee_found'] = True
-                        validation_result['matched_employee'] = emp
-                        validation_result['warnings'].append(f"Employee found by name but ID doesn't match. Expected: {emp.get('employee_code')}")
-                        break
+                emp = self._by_name.get(employee_name.lower())
+                if emp is not None:
+                    validation_result['employee_found'] = True
+                    validation_result['matched_employee'] = emp
+                    validation_result['warnings'].append(f"Employee found by name but ID doesn't match. Expected: {emp.get('employee_code')}")
             
             # If employee not found
             if not validation_result['employee_found']:
@@ -187,24 +217,19 @@ class EmployeeValidator:
             List of matching employees
         """
         try:
-            employees = self._load_employees_data()
+            self._load_employees_data()
             suggestions = []
             
             if not partial_name or not isinstance(partial_name, str):
                 return suggestions
             
             partial_name = partial_name.strip().lower()
+            partial_words = partial_name.split()
             
-            for emp in employees:
-                if not isinstance(emp, dict):
-                    continue
-                    
-                emp_name = str(emp.get('full_name', '')).lower()
-                emp_id = str(emp.get('employee_code', '')).lower()
-                
+            for emp_name, emp_id, emp in self._search_rows:
                 if (partial_name in emp_name or 
                     partial_name in emp_id or 
-                    any(word in emp_name for word in partial_name.split())):
+                    any(word in emp_name for word in partial_words)):
                     suggestions.append({
                         'full_name': emp.get('full_name', ''),
                         'employee_code': emp.get('employee_code', ''),
@@ -237,17 +262,15 @@ class EmployeeValidator:
             if not employee_id or not isinstance(employee_id, str):
                 return None
                 
-            employees = self._load_employees_data()
-            
-            for emp in employees:
-                if not isinstance(emp, dict):
-                    continue
-                    
-                if emp.get('employee_code', '').strip().upper() == employee_id.strip().upper():
-                    return emp
-            
-            return None
+            self._load_employees_data()
+            return self._by_code.get(employee_id.strip().upper())
             
         except Exception as e:
             print(f"Error getting employee by ID: {str(e)}")
             return None
+
+
+@lru_cache(maxsize=1)
+def get_employee_validator() -> EmployeeValidator:
+    """Get the shared EmployeeValidator so employee data is loaded once per process"""
+    return EmployeeValidator()
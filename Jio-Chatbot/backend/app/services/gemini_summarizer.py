@@ -9,22 +9,24 @@ TODO List:
 7. Scalable multi-user handling - DONE
 8. Error handling and retry logic - DONE
 9. Rate limiting and cost optimization - DONE
-10. Caching for repeated documents - TODO
+10. Caching for repeated documents - DONE
 """
 
 import os
-import re
 import json
 import asyncio
+import hashlib
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional, Any
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 import pandas as pd
 import google.generativeai as genai
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from .doc_parser import parse_document
-from .pdf_analyzer import PDFAnalyzer, DocumentStructure
+from .doc_parser import parse_document_async
+from .pdf_analyzer import PDFAnalyzer, DocumentStructure, TableData
 
 
 @dataclass
@@ -80,28 +82,59 @@ class GeminiSummarizer:
         self.max_concurrent_requests = 5  # Rate limiting
         self.retry_attempts = 3
         self.chunk_overlap = 1000  # Words overlap between chunks
+        self.max_chunk_chars = 50000  # Document content allowed in one prompt
         
         # Initialize components
         self.pdf_analyzer = PDFAnalyzer()
         
-        # Thread pool for concurrent processing
-        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrent_requests)
+        # Caps concurrent Gemini calls (rate limiting)
+        self._gemini_slots = asyncio.Semaphore(self.max_concurrent_requests)
+        
+        # In-flight summarizations keyed by document, shared by concurrent callers
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
+        # Completed summaries keyed by document, so re-uploads skip Gemini
+        self.summary_cache_size = 32
+        self._summary_cache: "OrderedDict[str, SummaryResult]" = OrderedDict()
+    
+    async def summarize_pdf(self, filename: str, content: bytes, raw_text: Optional[str] = None) -> SummaryResult:
+        """Main function to summarize PDF using Gemini (raw_text skips re-parsing if already extracted)"""
+        # Concurrent requests for the same document share a single summarization
+        digest = await asyncio.to_thread(hashlib.sha256, content)
+        key = f"{filename}:{digest.hexdigest()}"
+        
+        cached = self._summary_cache.get(key)
+        if cached is not None:
+            self._summary_cache.move_to_end(key)
+            return cached
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._summarize_pdf(filename, content, raw_text))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shield so one caller disconnecting does not cancel the others
+        result = await asyncio.shield(task)
+        
+        self._summary_cache[key] = result
+        self._summary_cache.move_to_end(key)
+        if len(self._summary_cache) > self.summary_cache_size:
+            self._summary_cache.popitem(last=False)
+        return result
     
-    async def summarize_pdf(self, filename: str, content: bytes) -> SummaryResult:
-        """Main function to summarize PDF using Gemini"""
+    async def _summarize_pdf(self, filename: str, content: bytes, raw_text: Optional[str] = None) -> SummaryResult:
+        """Parse, chunk and summarize a PDF with Gemini"""
         import time
         start_time = time.time()
         
         try:
-            # Step 1: Analyze document structure
-            structure = self.pdf_analyzer.analyze_document(filename, content)
+            # Step 1: Extract text once in the parser pool (parsing is the slowest step)
+            if raw_text is None:
+                raw_text = await parse_document_async(filename, content)
             
-            # Step 2: Extract text and tables
-            raw_text = parse_document(filename, content)
-            tables = self._extract_tables_structured(raw_text)
-            
-            # Step 3: Chunk content for large documents
-            chunks = self._create_chunks(raw_text, structure.total_pages)
+            # Steps 2-3 are CPU-bound analysis; keep them off the event loop
+            structure, tables, chunks = await asyncio.to_thread(self._prepare_document, filename, content, raw_text)
             
             # Step 4: Generate summaries using Gemini
             if len(chunks) == 1:
@@ -128,59 +161,36 @@ class GeminiSummarizer:
         except Exception as e:
             raise Exception(f"PDF summarization failed: {str(e)}")
     
-    async def _summarize_with_gemini(self, raw_text: str, tables: List[TableInfo], structure: DocumentStructure, start_time: float) -> SummaryResult:
-        """Summarize using Gemini API"""
+    def _prepare_document(self, filename: str, content: bytes, raw_text: str) -> Tuple[DocumentStructure, List[TableInfo], List[ChunkInfo]]:
+        """Analyze the parsed document and split it into chunks (blocking)"""
+        # Step 2: Analyze document structure and format the tables found
+        structure = self.pdf_analyzer.analyze_document(filename, content, raw_text=raw_text)
+        tables = self._extract_tables_structured(structure.tables)
+        
         # Step 3: Chunk content for large documents
         chunks = self._create_chunks(raw_text, structure.total_pages)
         
-        # Step 4: Generate summaries using Gemini
-        if len(chunks) == 1:
-            # Single chunk - direct summarization
-            summary = await self._summarize_single_chunk(chunks[0], tables, structure.doc_type)
-        else:
-            # Multiple chunks - map-reduce approach
-            summary = await self._summarize_multiple_chunks(chunks, tables, structure.doc_type)
-        
-        # Step 5: Format final result
-        processing_time = time.time() - start_time
-        
-        return SummaryResult(
-            document_type=structure.doc_type,
-            executive_summary=summary["executive_summary"],
-            key_points=summary["key_points"],
-            tables=tables,
-            section_summaries=summary.get("section_summaries", []),
-            total_pages=structure.total_pages,
-            processing_time=processing_time,
-            model_used="gemini-2.0-flash-exp"
-        )
+        return structure, tables, chunks
     
-    def _extract_tables_structured(self, text: str) -> List[TableInfo]:
-        """Extract tables in structured format for Gemini"""
-        tables = []
-        
-        # Use existing table extraction logic
-        table_data_list = self.pdf_analyzer._extract_tables(text)
-        
-        for i, table_data in enumerate(table_data_list):
-            if table_data and table_data.data is not None:
-                # Convert to CSV text
-                csv_text = table_data.data.to_csv(index=False)
-                
-                # Convert to markdown
-                markdown = self._dataframe_to_markdown(table_data.data)
-                
-                tables.append(TableInfo(
-                    id=i + 1,
-                    title=table_data.title,
-                    data=table_data.data,
-                    markdown=markdown,
-                    csv_text=csv_text,
-                    row_count=table_data.row_count,
-                    col_count=table_data.col_count
-                ))
-        
-        return tables
+    def _extract_tables_structured(self, extracted_tables: List[TableData]) -> List[TableInfo]:
+        """Convert tables extracted by the PDF analyzer to structured format for Gemini"""
+        table_data_list = [
+            table_data for table_data in extracted_tables
+            if table_data and table_data.data is not None
+        ]
+        return [self._build_table_info(i, table_data) for i, table_data in enumerate(table_data_list, 1)]
+    
+    def _build_table_info(self, table_id: int, table_data: TableData) -> TableInfo:
+        """Convert one extracted table to CSV and markdown"""
+        return TableInfo(
+            id=table_id,
+            title=table_data.title,
+            data=table_data.data,
+            markdown=self._dataframe_to_markdown(table_data.data),
+            csv_text=table_data.data.to_csv(index=False),
+            row_count=table_data.row_count,
+            col_count=table_data.col_count
+        )
     
     def _dataframe_to_markdown(self, df: pd.DataFrame) -> str:
         """Convert DataFrame to markdown table"""
@@ -188,17 +198,21 @@ class GeminiSummarizer:
             return "Empty table"
         
         # Create markdown table
-        markdown = "| " + " | ".join(str(col) for col in df.columns) + " |\n"
-        markdown += "| " + " | ".join(["---"] * len(df.columns)) + " |\n"
+        lines = [
+            "| " + " | ".join(str(col) for col in df.columns) + " |\n",
+            "| " + " | ".join(["---"] * len(df.columns)) + " |\n"
+        ]
         
         # Add data rows (limit to first 20 rows for readability)
-        for _, row in df.head(20).iterrows():
-            markdown += "| " + " | ".join(str(cell) for cell in row) + " |\n"
+        lines.extend(
+            "| " + " | ".join(row) + " |\n"
+            for row in df.head(20).astype(str).itertuples(index=False, name=None)
+        )
         
         if len(df) > 20:
-            markdown += f"\n*... and {len(df) - 20} more rows*\n"
+            lines.append(f"\n*... and {len(df) - 20} more rows*\n")
         
-        return markdown
+        return "".join(lines)
     
     def _create_chunks(self, text: str, total_pages: int) -> List[ChunkInfo]:
         """Create chunks for large documents"""
@@ -208,7 +222,7 @@ class GeminiSummarizer:
         # Estimate tokens (rough approximation: 1 word ≈ 1.3 tokens)
         estimated_tokens = int(total_words * 1.3)
         
-        if estimated_tokens <= self.max_tokens_per_chunk:
+        if total_words == 0 or (estimated_tokens <= self.max_tokens_per_chunk and len(text) <= self.max_chunk_chars):
             # Single chunk
             return [ChunkInfo(
                 id=1,
@@ -219,10 +233,14 @@ class GeminiSummarizer:
                 token_estimate=estimated_tokens
             )]
         
-        # Multiple chunks needed
+        # Multiple chunks needed - size them to fit the prompt so nothing is truncated
         chunks = []
-        chunk_size = int(self.max_tokens_per_chunk / 1.3)  # Convert back to words
-        overlap_words = self.chunk_overlap
+        chars_per_word = (sum(map(len, words)) + total_words) / total_words
+        chunk_size = min(
+            int(self.max_tokens_per_chunk / 1.3),  # Convert back to words
+            max(1, int(self.max_chunk_chars * 0.9 / chars_per_word))  # Headroom for long words
+        )
+        overlap_words = min(self.chunk_overlap, chunk_size // 2)
         
         for i in range(0, total_words, chunk_size - overlap_words):
             end_idx = min(i + chunk_size, total_words)
@@ -246,7 +264,7 @@ class GeminiSummarizer:
     
     async def _summarize_single_chunk(self, chunk: ChunkInfo, tables: List[TableInfo], doc_type: str) -> Dict:
         """Summarize a single chunk using Gemini"""
-        prompt = self._create_summarization_prompt(chunk.content, tables, doc_type, is_single_chunk=True)
+        prompt = self._create_summarization_prompt(chunk.content, self._format_tables_section(tables), doc_type, is_single_chunk=True)
         
         response = await self._call_gemini_with_retry(prompt)
         return self._parse_summary_response(response)
@@ -254,12 +272,13 @@ class GeminiSummarizer:
     async def _summarize_multiple_chunks(self, chunks: List[ChunkInfo], tables: List[TableInfo], doc_type: str) -> Dict:
         """Summarize multiple chunks using map-reduce approach"""
         
-        # Step 1: Summarize each chunk
+        # Step 1: Summarize each chunk (the tables section is the same for every chunk)
         chunk_summaries = []
         tasks = []
+        tables_section = self._format_tables_section(tables)
         
         for chunk in chunks:
-            task = self._summarize_chunk_async(chunk, tables, doc_type)
+            task = self._summarize_chunk_async(chunk, tables_section, doc_type)
             tasks.append(task)
         
         # Execute all chunk summaries concurrently
@@ -288,13 +307,28 @@ class GeminiSummarizer:
         final_response = await self._call_gemini_with_retry(final_prompt)
         return self._parse_summary_response(final_response)
     
-    async def _summarize_chunk_async(self, chunk: ChunkInfo, tables: List[TableInfo], doc_type: str) -> str:
+    async def _summarize_chunk_async(self, chunk: ChunkInfo, tables_section: str, doc_type: str) -> str:
         """Asynchronously summarize a single chunk"""
-        prompt = self._create_summarization_prompt(chunk.content, tables, doc_type, is_single_chunk=False)
+        prompt = self._create_summarization_prompt(chunk.content, tables_section, doc_type, is_single_chunk=False)
         response = await self._call_gemini_with_retry(prompt)
         return response
     
-    def _create_summarization_prompt(self, text: str, tables: List[TableInfo], doc_type: str, is_single_chunk: bool) -> str:
+    def _format_tables_section(self, tables: List[TableInfo]) -> str:
+        """Format the TABLES FOUND section of the summarization prompt"""
+        if not tables:
+            return ""
+        
+        parts = ["\nTABLES FOUND:\n"]
+        for table in tables:
+            parts.append(f"\nTable {table.id}: {table.title}\n")
+            parts.append(f"Dimensions: {table.row_count} rows × {table.col_count} columns\n")
+            parts.append("Data (CSV format):\n")
+            parts.append(table.csv_text[:10000] + "\n")  # Limit table size
+            parts.append("Markdown format:\n")
+            parts.append(table.markdown + "\n")
+        return "".join(parts)
+    
+    def _create_summarization_prompt(self, text: str, tables_section: str, doc_type: str, is_single_chunk: bool) -> str:
         """Create prompt for Gemini summarization"""
         
         prompt = f"""You are an expert document analyst. Analyze the following document content and provide a comprehensive summary.
@@ -310,19 +344,11 @@ INSTRUCTIONS:
 5. Focus on actionable insights and main takeaways
 
 DOCUMENT CONTENT:
-{text[:50000]}  # Limit content length for API
+{text[:self.max_chunk_chars]}  # Limit content length for API
 
 """
 
-        if tables:
-            prompt += "\nTABLES FOUND:\n"
-            for table in tables:
-                prompt += f"\nTable {table.id}: {table.title}\n"
-                prompt += f"Dimensions: {table.row_count} rows × {table.col_count} columns\n"
-                prompt += "Data (CSV format):\n"
-                prompt += table.csv_text[:10000] + "\n"  # Limit table size
-                prompt += "Markdown format:\n"
-                prompt += table.markdown + "\n"
+        prompt += tables_section
         
         prompt += """
 
@@ -366,9 +392,10 @@ COMBINED CHUNK SUMMARIES:
 """
 
         if tables:
-            prompt += "\nTABLES SUMMARY:\n"
-            for table in tables:
-                prompt += f"\nTable {table.id}: {table.title} ({table.row_count} rows, {table.col_count} columns)\n"
+            prompt += "\nTABLES SUMMARY:\n" + "".join(
+                f"\nTable {table.id}: {table.title} ({table.row_count} rows, {table.col_count} columns)\n"
+                for table in tables
+            )
         
         prompt += """
 
@@ -395,13 +422,9 @@ Provide your response in valid JSON format only."""
         """Call Gemini API with retry logic"""
         for attempt in range(self.retry_attempts):
             try:
-                # Run the synchronous Gemini call in a thread pool
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(
-                    self.executor, 
-                    self.model.generate_content, 
-                    prompt
-                )
+                # Native async call over the SDK's persistent channel, no thread hop
+                async with self._gemini_slots:
+                    response = await self.model.generate_content_async(prompt)
                 return response.text
             except Exception as e:
                 if attempt == self.retry_attempts - 1:
@@ -415,10 +438,11 @@ Provide your response in valid JSON format only."""
     def _parse_summary_response(self, response: str) -> Dict:
         """Parse Gemini response and extract structured data"""
         try:
-            # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
+            # Try to extract JSON from response (first '{' through last '}')
+            json_start = response.find('{')
+            json_end = response.rfind('}')
+            if json_start != -1 and json_end > json_start:
+                json_str = response[json_start:json_end + 1]
                 return json.loads(json_str)
             
             # Fallback: parse as text
@@ -481,7 +505,9 @@ Provide your response in valid JSON format only."""
                     markdown += "\n"
         
         return markdown
-    
-    def cleanup(self):
-        """Cleanup resources"""
-        self.executor.shutdown(wait=True)
+
+
+@lru_cache(maxsize=1)
+def get_gemini_summarizer() -> GeminiSummarizer:
+    """Get the shared GeminiSummarizer, created on first use"""
+    return GeminiSummarizer()
@@ -7,6 +7,20 @@ from pathlib import Path
 from .doc_parser import parse_document
 
 
+# Patterns compiled once at import instead of on every call
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Column separators counted when deciding whether a block looks like a table
+_SEPARATORS = ('|', ',', ';', '\t')
+
+# Common section patterns
+_SECTION_PATTERNS = [
+    re.compile(r'^\d+\.\s*([A-Z][^.\n]+)'),  # 1. Section Name
+    re.compile(r'^([A-Z][A-Z\s]+):'),        # SECTION NAME:
+    re.compile(r'^([A-Z][a-z\s]+)\n[-=]+'),  # Section Name\n----
+]
+
+
 @dataclass
 class TableData:
     """Represents extracted table data"""
@@ -32,17 +46,19 @@ class DocumentStructure:
 
 class PDFAnalyzer:
     def __init__(self):
-        self.table_patterns = [
+        # Table patterns, combined into one scan
+        self.table_pattern = re.compile('|'.join(f'(?:{pattern})' for pattern in [
             r'\b\d+\s*\|\s*\d+\s*\|\s*\d+',  # Number | Number | Number
             r'\b[A-Z][a-z]+\s*\|\s*\d+',     # Word | Number
             r'\b\d+\s*%\s*\|\s*\d+',         # Number% | Number
             r'\b[A-Z]{2,}\s*\|\s*[A-Z]{2,}', # UPPERCASE | UPPERCASE
-        ]
+        ]))
         
-    def analyze_document(self, filename: str, content: bytes) -> DocumentStructure:
-        """Main analysis function"""
+    def analyze_document(self, filename: str, content: bytes, raw_text: Optional[str] = None) -> DocumentStructure:
+        """Main analysis function (pass raw_text if the document is already parsed)"""
         # Parse document
-        raw_text = parse_document(filename, content)
+        if raw_text is None:
+            raw_text = parse_document(filename, content)
         
         # Extract structure information
         text_blocks = self._extract_text_blocks(raw_text)
@@ -90,16 +106,12 @@ class PDFAnalyzer:
         if len(lines) < 2:
             return False
         
-        # Check for table patterns
-        for pattern in self.table_patterns:
-            if re.search(pattern, text):
-                return True
+        # Check for table patterns (every pattern needs a '|')
+        if '|' in text and self.table_pattern.search(text):
+            return True
         
-        # Check for consistent separators
-        separator_counts = []
-        for line in lines[:5]:  # Check first 5 lines
-            separators = len(re.findall(r'[|,;\t]', line))
-            separator_counts.append(separators)
+        # Check for consistent separators (first 5 lines)
+        separator_counts = [sum(map(line.count, _SEPARATORS)) for line in lines[:5]]
         
         # If most lines have similar separator counts, likely a table
         if len(set(separator_counts)) <= 2 and max(separator_counts) > 0:
@@ -147,7 +159,7 @@ class PDFAnalyzer:
             cleaned_lines = []
             for line in lines:
                 # Replace multiple spaces with single space
-                line = re.sub(r'\s+', ' ', line.strip())
+                line = _WHITESPACE_RE.sub(' ', line.strip())
                 # Split by common table separators
                 if '|' in line:
                     parts = [p.strip() for p in line.split('|')]
@@ -174,17 +186,14 @@ class PDFAnalyzer:
         """Identify document sections"""
         sections = []
         
-        # Common section patterns
-        section_patterns = [
-            r'^\d+\.\s*([A-Z][^.\n]+)',  # 1. Section Name
-            r'^([A-Z][A-Z\s]+):',        # SECTION NAME:
-            r'^([A-Z][a-z\s]+)\n[-=]+',  # Section Name\n----
-        ]
-        
         lines = text.split('\n')
         for line in lines:
-            for pattern in section_patterns:
-                match = re.match(pattern, line.strip())
+            line = line.strip()
+            # Every section pattern starts with a digit or an uppercase letter
+            if not line or not (line[0].isdigit() or 'A' <= line[0] <= 'Z'):
+                continue
+            for pattern in _SECTION_PATTERNS:
+                match = pattern.match(line)
                 if match:
                     section_name = match.group(1).strip()
                     if len(section_name) > 3:  # Avoid short matches
@@ -244,22 +253,25 @@ class PDFAnalyzer:
         insights = []
         
         try:
-            # Check for numeric columns
+            # Check for numeric columns (statistics for all of them in one pass)
             numeric_cols = df.select_dtypes(include=['number']).columns
             if len(numeric_cols) > 0:
+                stats = df[numeric_cols].agg(['count', 'min', 'max', 'mean'])
                 for col in numeric_cols:
-                    if df[col].notna().sum() > 0:
-                        min_val = df[col].min()
-                        max_val = df[col].max()
-                        avg_val = df[col].mean()
+                    if stats.at['count', col] > 0:  # Non-null values present
+                        min_val = stats.at['min', col]
+                        max_val = stats.at['max', col]
+                        avg_val = stats.at['mean', col]
                         insights.append(f"Column '{col}': Range {min_val:.2f} - {max_val:.2f}, Average {avg_val:.2f}")
             
             # Check for categorical columns
             categorical_cols = df.select_dtypes(include=['object']).columns
             for col in categorical_cols:
-                unique_count = df[col].nunique()
+                # One counting pass gives both the unique count and the top values
+                value_counts = df[col].value_counts()
+                unique_count = len(value_counts)
                 if unique_count < 20:  # Not too many unique values
-                    top_values = df[col].value_counts().head(3)
+                    top_values = value_counts.head(3)
                     insights.append(f"Column '{col}': {unique_count} unique values, top: {dict(top_values)}")
         
         except Exception:
@@ -1,46 +1,246 @@
 import os
 import re
+import hashlib
 from typing import Optional, List, Dict, Tuple
 from datetime import datetime
 import asyncio
 import logging
 import json
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 
 import google.generativeai as genai
 from sentence_transformers import SentenceTransformer
+from sentence_transformers.util import batch_to_device
 import numpy as np
+import torch
 
-from .document_request_handler import DocumentRequestHandler
+from .document_request_handler import DocumentRequestHandler, get_document_request_handler
 from ..config import get_company_name
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Parse the QA dataset with orjson when it is installed (same results, several times faster)
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 
+# Text normalization patterns used by _preprocess_text, compiled once at import
+_TEXT_NORMALIZATIONS = (
+    # Fix common typos
+    (re.compile(r'\bpollicy\b'), 'policy'),
+    (re.compile(r'\bwfh\b'), 'work from home'),
+    # Normalize greeting variations
+    (re.compile(r'\bheyy+\b'), 'hey'),  # heyyy -> hey
+    (re.compile(r'\bhelloo+\b'), 'hello'),  # hellooo -> hello
+    (re.compile(r'\bhii+\b'), 'hi'),  # hiii -> hi
+)
+_PUNCTUATION_RE = re.compile(r'[^\w\s\-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Common HR and policy keywords with better categorization
+_HR_KEYWORDS = frozenset({
+    # Policy types
+    'policy', 'policies', 'attendance', 'leave', 'work', 'home', 'wfh', 'dress', 'code', 'conduct', 'handbook', 'onboarding', 'performance', 'reimbursement',
+    'device', 'password', 'software', 'helpdesk', 'it', 'support', 'acceptable', 'use', 'sop', 'procedure',
+    
+    # Benefits and compensation
+    'benefits', 'salary', 'compensation', 'bonus', 'insurance', 'health', 'dental', 'vision', 'wellness',
+    
+    # Time and attendance
+    'time', 'hours', 'tardiness', 'late', 'early', 'overtime', 'schedule', 'flexible',
+    
+    # Leave and time off
+    'vacation', 'holiday', 'sick', 'emergency', 'pto', 'paid', 'unpaid', 'carry', 'over',
+    
+    # Workplace behavior
+    'respect', 'dignity', 'harassment', 'discrimination', 'ethics', 'ethical', 'unethical', 'violation', 'report', 'retaliation',
+    
+    # Training and development
+    'training', 'development', 'certification', 'workshop', 'conference', 'career',
+    
+    # General HR terms
+    'hr', 'human', 'resource', 'employee', 'employer', 'company', 'organization', 'workplace', 'manager', 'supervisor',
+    
+    # Emotion and greeting keywords
+    'hello', 'hi', 'hey', 'good', 'morning', 'afternoon', 'evening', 'how', 'are', 'you',
+    'feel', 'ok', 'well', 'going', 'everything', 'fine', 'great', 'thanks', 'thank', 'welcome', 'bye', 'goodbye'
+})
+
+# Policy keywords a matched question must share with a policy question
+_POLICY_KEYWORDS = frozenset({
+    'policy', 'policies', 'attendance', 'leave', 'wfh', 'dress', 'conduct', 'handbook', 'onboarding',
+    'performance', 'reimbursement', 'it', 'device', 'password', 'software', 'helpdesk'
+})
+_POLICY_INDICATORS = (
+    'policy', 'attendance', 'leave', 'wfh', 'dress', 'conduct', 'handbook', 'onboarding',
+    'performance', 'reimbursement', 'it', 'device', 'password', 'software', 'helpdesk'
+)
+
+# Sentence transformer used for semantic search (also part of the embedding cache key)
+_SENTENCE_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Number of nearest dataset questions re-ranked with keyword similarity
+_TOP_MATCHES = 10
+
+# Dataset matches reused for paraphrases whose embedding is at least this similar to an earlier question
+_SEMANTIC_CACHE_THRESHOLD = 0.92
+
+# Gemini fallbacks that reflect a transient failure and must not be cached
+_GEMINI_UNAVAILABLE = "I apologize, but I'm currently unable to process your request. Please try again later."
+_GEMINI_EMPTY = "I apologize, but I couldn't generate a response. Please try rephrasing your question."
+_GEMINI_ERROR = "I apologize, but I'm experiencing technical difficulties. Please try again later."
+_TRANSIENT_ANSWERS = frozenset({_GEMINI_UNAVAILABLE, _GEMINI_EMPTY, _GEMINI_ERROR})
+
+# Concurrent query encodes are collected for up to this long and run as one batch
+_ENCODE_BATCH_SIZE = 32
+_ENCODE_BATCH_WAIT = 0.005  # seconds
+
+
+def _phrase_pattern(phrases) -> re.Pattern:
+    """Compile phrases into one alternation matching any of them as a substring"""
+    return re.compile('|'.join(re.escape(phrase) for phrase in phrases))
+
+
+# Conversational phrases checked in answer(), each category scanned with one search
+_GREETING_RE = _phrase_pattern(['hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening', 'how are you'])
+_EMOTION_RE = _phrase_pattern(['how are you', 'how do you feel', 'are you ok', 'are you well', 'how is it going', 'how is everything'])
+_CAPABILITY_RE = _phrase_pattern(['what can you do', 'help', 'capabilities', 'features'])
+
+# Replies that select a document from the numbered list (1-16)
+_DOCUMENT_NUMBERS = frozenset(str(n) for n in range(1, 17))
+
+# Phrases that mark a document request ('need document', 'get document', ... are covered by 'document')
+_DOCUMENT_REQUEST_RE = _phrase_pattern([
+    'document', 'experience letter', 'employment letter', 'salary slip', 'form 16', 'bonafide',
+    'certificate', 'noc', 'relieving letter', 'offer letter', 'appointment letter',
+    'promotion letter', 'pf statement', 'uan details', 'medical insurance',
+    'id card', 'visa support', 'travel authorization'
+])
+
+# Documents with a dedicated reply in _handle_specific_document_request
+_SPECIFIC_DOCUMENT_RE = _phrase_pattern(['experience letter', 'employment letter', 'salary slip', 'form 16', 'bonafide', 'certificate'])
+
+# Field labels that mark a message as filled-in document request details
+_DOCUMENT_DETAILS_RE = _phrase_pattern(['name:', 'employee id:', 'id:', 'department:', 'designation:', 'joining date:', 'purpose:'])
+
+
+@lru_cache(maxsize=8)
+def _gemini_prompt_prefix(company_name: str) -> str:
+    """Static part of the Gemini prompt before the question, built once per company name"""
+    return f"""
+            You are an AI assistant for {company_name}. 
+            Answer the following question about company policies, procedures, or general HR matters.
+            Be helpful, professional, and accurate. If you're not sure about something, say so.
+            
+            **Available Policy Topics:**
+            - Attendance Policy (work hours, tardiness)
+            - Leave Policy (20 days annual leave, submission requirements)
+            - Work From Home Policy (3 days/week, manager approval)
+            - Dress Code Policy (business casual)
+            - Performance Review Policy (bi-annual reviews)
+            - Reimbursement Policy (30-day submission, receipts required)
+            - Code of Conduct (respect, zero tolerance for harassment)
+            - Employee Handbook (mission, values, policies)
+            - Onboarding (2-week program, mandatory training)
+            - IT Policies (device, password, software, helpdesk)
+            
+            **Important Guidelines:**
+            - For general policy questions, provide an overview of the policy
+            - For specific scenarios, provide practical guidance
+            - Always include contact information when relevant
+            - Be friendly and professional in tone
+            - If the question is unclear, ask for clarification
+            - For greetings and emotion-based questions, respond warmly and professionally
+            - For "how are you" type questions, respond positively about being ready to help
+            
+            **Question:** """
+
+
+_GEMINI_PROMPT_SUFFIX = """
+            
+            Please provide a clear, helpful response based on the available policy information:
+            """
+
+# Reply sent when a message looks like document request details
+_DOCUMENT_DETAILS_RECEIVED = """📝 **Document Request Details Received**
+
+Thank you for providing the details! I've received your document request information.
+
+**Next Steps:**
+1. Your request has been logged in our system
+2. HR will review and process your request
+3. You'll receive a confirmation email with tracking details
+4. The document will be generated and sent to you within 2-3 business days
+
+**Contact HR:**
+• Email: {company_email}
+• Phone: Available through internal directory
+
+If you need immediate assistance, please contact HR directly."""
+
+
 class HybridQAEngine:
     def __init__(self) -> None:
-        # Initialize with safe defaults
-        self.gemini_model = None
+        # Initialize with safe defaults (Gemini and the document handler are created on first use)
+        self._gemini_model = None
+        self._gemini_checked = False
         self.sentence_model = None
         self.qa_dataset = []
         self.qa_embeddings = []
-        self.doc_handler = None
-        self._current_document_request = None
+        self.qa_questions: List[str] = []
+        self.qa_answers: List[str] = []
+        self._qa_lookup: List[Tuple[str, str]] = []
+        self._qa_keywords: List[set] = []
+        self._keyword_index: Dict[str, List[int]] = {}
+        self._doc_handler = None
+        self._doc_handler_checked = False
+        self._encode_queue: Optional[asyncio.Queue] = None
+        self._encode_batcher: Optional[asyncio.Task] = None
+        self.answer_cache_size = 1024
+        self._gemini_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._gemini_inflight: Dict[str, asyncio.Future] = {}
+        
+        # Answer caches: exact repeats by normalized text, paraphrases by query embedding
+        # (the semantic cache holds matched dataset indices only; it is read and written
+        # synchronously on the event loop, so it needs no lock)
+        self._answer_cache: "OrderedDict[str, str]" = OrderedDict()
+        self.semantic_cache_size = 256
+        self._semantic_cache_vecs: Optional[np.ndarray] = None
+        self._semantic_cache_indices: List[int] = []
+        self._semantic_cache_next = 0
         
         # Initialize services with better error handling
-        self._initialize_gemini()
         self._initialize_sentence_transformer()
         self._load_qa_dataset()
-        
-        # Initialize document request handler with better error handling
+    
+    @property
+    def gemini_model(self):
+        """Gemini model, configured the first time it is needed"""
+        if not self._gemini_checked:
+            self._gemini_checked = True
+            self._initialize_gemini()
+        return self._gemini_model
+    
+    @property
+    def doc_handler(self) -> Optional[DocumentRequestHandler]:
+        """Document request handler, created the first time it is needed"""
+        if not self._doc_handler_checked:
+            self._doc_handler_checked = True
+            self._initialize_doc_handler()
+        return self._doc_handler
+    
+    def _initialize_doc_handler(self):
+        """Initialize document request handler with better error handling"""
         try:
-            self.doc_handler = DocumentRequestHandler()
+            self._doc_handler = get_document_request_handler()
             logger.info("✅ Document request handler initialized successfully")
         except Exception as e:
             logger.error(f"❌ Failed to initialize document request handler: {str(e)}")
-            self.doc_handler = None
+            self._doc_handler = None
     
     def _initialize_gemini(self):
         """Initialize Gemini model with enhanced error handling"""
@@ -51,11 +251,11 @@ class HybridQAEngine:
                 return
             
             genai.configure(api_key=api_key)
-            self.gemini_model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            self._gemini_model = genai.GenerativeModel('gemini-2.0-flash-exp')
             logger.info("✅ Gemini model initialized successfully")
         except Exception as e:
             logger.error(f"❌ Failed to initialize Gemini model: {str(e)}")
-            self.gemini_model = None
+            self._gemini_model = None
 
     def _initialize_sentence_transformer(self):
         """Initialize sentence transformer for semantic search"""
@@ -88,7 +288,12 @@ class HybridQAEngine:
                 self.sentence_model = SentenceTransformer(str(model_path))
             else:
                 logger.info("⚠️ Local model not found, using cache directory")
-                self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2', cache_folder=str(cache_dir))
+                self.sentence_model = SentenceTransformer(_SENTENCE_MODEL_NAME, cache_folder=str(cache_dir))
+            
+            # Half precision on GPU (tensor cores); embeddings are converted back to float32 for scoring
+            if self.sentence_model.device.type == 'cuda':
+                self.sentence_model.half()
+                logger.info("✅ Sentence transformer running in FP16 on GPU")
             logger.info("✅ Sentence transformer initialized successfully")
         except Exception as e:
             logger.error(f"❌ Failed to initialize sentence transformer: {str(e)}")
@@ -108,21 +313,21 @@ class HybridQAEngine:
             file_size = qa_file.stat().st_size
             logger.info(f"📁 QA dataset file size: {file_size} bytes")
             
-            # Read file content first to check for issues
-            with open(qa_file, 'r', encoding='utf-8') as f:
+            # Read raw bytes first to check for issues (the parser decodes UTF-8 itself)
+            with open(qa_file, 'rb') as f:
                 content = f.read()
             
-            logger.info(f"📄 File content length: {len(content)} characters")
+            logger.info(f"📄 File content length: {len(content)} bytes")
             
             # Parse JSON with better error handling
             try:
-                self.qa_dataset = json.loads(content)
+                self.qa_dataset = _json_loads(content)
                 logger.info(f"📊 Successfully parsed JSON with {len(self.qa_dataset)} QA pairs")
             except json.JSONDecodeError as e:
                 logger.error(f"❌ JSON parsing error: {str(e)}")
                 logger.error(f"❌ Error at line {e.lineno}, column {e.colno}")
                 # Try to show the problematic area
-                lines = content.split('\n')
+                lines = content.decode('utf-8', errors='replace').split('\n')
                 if e.lineno <= len(lines):
                     logger.error(f"❌ Problematic line {e.lineno}: {lines[e.lineno-1]}")
                 return
@@ -143,11 +348,25 @@ class HybridQAEngine:
             
             logger.info(f"📊 Found {valid_pairs} valid QA pairs out of {len(self.qa_dataset)} total entries")
             
+            # Parallel question/answer lists; row i of qa_embeddings belongs to entry i
+            valid = [qa for qa in self.qa_dataset if isinstance(qa, dict) and 'question' in qa and 'answer' in qa]
+            self.qa_questions = [qa['question'] for qa in valid]
+            self.qa_answers = [qa['answer'] for qa in valid]
+            
+            # Lowercase the dataset questions once for the conversational checks in answer()
+            self._qa_lookup = [(q.lower(), a) for q, a in zip(self.qa_questions, self.qa_answers)]
+            
+            # Keywords per dataset question, plus keyword -> rows so lookups only visit overlapping rows
+            self._qa_keywords = [self._extract_keywords(q) for q in self.qa_questions]
+            self._keyword_index = {}
+            for i, keywords in enumerate(self._qa_keywords):
+                for keyword in keywords:
+                    self._keyword_index.setdefault(keyword, []).append(i)
+            
             # Pre-compute embeddings for all questions
-            if self.sentence_model and self.qa_dataset:
-                questions = [qa['question'] for qa in self.qa_dataset if isinstance(qa, dict) and 'question' in qa]
-                logger.info(f"🔄 Computing embeddings for {len(questions)} questions...")
-                self.qa_embeddings = self.sentence_model.encode(questions)
+            if self.sentence_model and self.qa_questions:
+                logger.info(f"🔄 Computing embeddings for {len(self.qa_questions)} questions...")
+                self.qa_embeddings = self._load_or_compute_embeddings(self.qa_questions)
                 logger.info(f"✅ Successfully computed embeddings for {len(self.qa_embeddings)} questions")
             else:
                 logger.warning("⚠️ Could not compute embeddings - sentence model not available or dataset empty")
@@ -158,78 +377,100 @@ class HybridQAEngine:
             logger.error(f"❌ Traceback: {traceback.format_exc()}")
             self.qa_dataset = []
             self.qa_embeddings = []
+            self.qa_questions = []
+            self.qa_answers = []
+            self._qa_lookup = []
+            self._qa_keywords = []
+            self._keyword_index = {}
+    
+    def _load_or_compute_embeddings(self, questions: List[str]) -> np.ndarray:
+        """Return question embeddings, reusing the on-disk copy when the questions are unchanged"""
+        key = hashlib.sha256('\n'.join([_SENTENCE_MODEL_NAME, *questions]).encode('utf-8')).hexdigest()[:16]
+        cache_dir = Path(__file__).parent.parent.parent.parent / "models" / "embeddings"
+        cache_file = cache_dir / f"qa_{key}.npy"
+        
+        if cache_file.exists():
+            try:
+                embeddings = np.load(cache_file, mmap_mode='r')
+                if embeddings.shape[0] == len(questions):
+                    logger.info(f"✅ Loaded cached embeddings from {cache_file}")
+                    return embeddings
+            except Exception as e:
+                logger.warning(f"⚠️ Ignoring unreadable embedding cache {cache_file}: {str(e)}")
+        
+        # Reuse rows for questions that were already encoded; only new or edited ones hit the model
+        rows_file = cache_dir / "qa_rows.npz"
+        row_keys = [
+            hashlib.sha256(f"{_SENTENCE_MODEL_NAME}\n{question}".encode('utf-8')).hexdigest()[:16]
+            for question in questions
+        ]
+        known: Dict[str, np.ndarray] = {}
+        if rows_file.exists():
+            try:
+                with np.load(rows_file) as rows:
+                    known = dict(zip(rows['keys'].tolist(), rows['embeddings']))
+            except Exception as e:
+                logger.warning(f"⚠️ Ignoring unreadable embedding rows {rows_file}: {str(e)}")
+        
+        missing = [i for i, row_key in enumerate(row_keys) if row_key not in known]
+        # Contiguous float32 rows so each query is one SGEMV over the matrix
+        embeddings = np.empty((len(questions), self.sentence_model.get_sentence_embedding_dimension()), dtype=np.float32)
+        for i, row_key in enumerate(row_keys):
+            if row_key in known:
+                embeddings[i] = known[row_key]
+        
+        if missing:
+            logger.info(f"🔄 Encoding {len(missing)} new questions ({len(questions) - len(missing)} reused)")
+            # Unit-normalized once here so similarity is a plain dot product per query
+            with torch.inference_mode():
+                embeddings[missing] = self.sentence_model.encode(
+                    [questions[i] for i in missing], batch_size=64, normalize_embeddings=True, show_progress_bar=False
+                )
+        
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp.npy')
+            np.save(tmp_file, embeddings)
+            os.replace(tmp_file, cache_file)
+            
+            tmp_rows = rows_file.with_suffix('.tmp.npz')
+            np.savez(tmp_rows, keys=np.array(row_keys), embeddings=embeddings)
+            os.replace(tmp_rows, rows_file)
+            
+            # Drop caches left behind by earlier versions of the dataset
+            for stale in cache_dir.glob("qa_*.npy"):
+                if stale != cache_file and not stale.name.endswith(".tmp.npy"):
+                    stale.unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write embedding cache: {str(e)}")
+        
+        return embeddings
     
     def _preprocess_text(self, text: str) -> str:
         """Preprocess text for better matching"""
-        import re
-        
         # Convert to lowercase
         text = text.lower().strip()
         
-        # Fix common typos
-        text = re.sub(r'\bpollicy\b', 'policy', text)
-        text = re.sub(r'\battendance\b', 'attendance', text)
-        text = re.sub(r'\bleave\b', 'leave', text)
-        text = re.sub(r'\bwfh\b', 'work from home', text)
-        
-        # Normalize greeting variations
-        text = re.sub(r'\bheyy+\b', 'hey', text)  # heyyy -> hey
-        text = re.sub(r'\bhelloo+\b', 'hello', text)  # hellooo -> hello
-        text = re.sub(r'\bhii+\b', 'hi', text)  # hiii -> hi
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Fix common typos and normalize greeting variations
+        for pattern, replacement in _TEXT_NORMALIZATIONS:
+            text = pattern.sub(replacement, text)
         
         # Remove punctuation except for important ones
-        text = re.sub(r'[^\w\s\-]', ' ', text)
+        text = _PUNCTUATION_RE.sub(' ', text)
         
-        # Remove extra whitespace again
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        # Collapse whitespace
+        return _WHITESPACE_RE.sub(' ', text).strip()
     
     def _extract_keywords(self, text: str) -> set:
         """Extract important keywords from text"""
-        # Common HR and policy keywords with better categorization
-        hr_keywords = {
-            # Policy types
-            'policy', 'policies', 'attendance', 'leave', 'work', 'home', 'wfh', 'dress', 'code', 'conduct', 'handbook', 'onboarding', 'performance', 'reimbursement',
-            'device', 'password', 'software', 'helpdesk', 'it', 'support', 'acceptable', 'use', 'sop', 'procedure',
-            
-            # Benefits and compensation
-            'benefits', 'salary', 'compensation', 'bonus', 'insurance', 'health', 'dental', 'vision', 'wellness',
-            
-            # Time and attendance
-            'time', 'hours', 'tardiness', 'late', 'early', 'overtime', 'schedule', 'flexible',
-            
-            # Leave and time off
-            'vacation', 'holiday', 'sick', 'emergency', 'pto', 'paid', 'unpaid', 'carry', 'over',
-            
-            # Workplace behavior
-            'respect', 'dignity', 'harassment', 'discrimination', 'ethics', 'ethical', 'unethical', 'violation', 'report', 'retaliation',
-            
-            # Training and development
-            'training', 'development', 'certification', 'workshop', 'conference', 'career',
-            
-            # General HR terms
-            'hr', 'human', 'resource', 'employee', 'employer', 'company', 'organization', 'workplace', 'manager', 'supervisor',
-            
-            # Emotion and greeting keywords
-            'hello', 'hi', 'hey', 'good', 'morning', 'afternoon', 'evening', 'how', 'are', 'you',
-            'feel', 'ok', 'well', 'going', 'everything', 'fine', 'great', 'thanks', 'thank', 'welcome', 'bye', 'goodbye'
-        }
-        
         # Extract words from text
         words = set(self._preprocess_text(text).split())
         
         # Return intersection with HR keywords
-        return words.intersection(hr_keywords)
+        return words.intersection(_HR_KEYWORDS)
     
-    def _keyword_similarity(self, user_question: str, dataset_question: str) -> float:
-        """Calculate keyword-based similarity"""
-        user_keywords = self._extract_keywords(user_question)
-        dataset_keywords = self._extract_keywords(dataset_question)
-        
+    def _keyword_similarity(self, user_keywords: set, dataset_keywords: set) -> float:
+        """Calculate keyword-based similarity between two extracted keyword sets"""
         if not user_keywords or not dataset_keywords:
             return 0.0
         
@@ -239,60 +480,104 @@ class HybridQAEngine:
         
         return intersection / union if union > 0 else 0.0
     
-    def _find_similar_question(self, user_question: str, threshold: float = 0.75) -> Optional[Dict]:
+    async def _encode_query(self, text: str) -> np.ndarray:
+        """Encode a query, batching it with any other queries arriving at the same time"""
+        if self._encode_batcher is None or self._encode_batcher.done():
+            self._encode_queue = asyncio.Queue()
+            self._encode_batcher = asyncio.create_task(self._encode_batcher_loop(self._encode_queue))
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._encode_queue.put((text, future))
+        return await future
+    
+    async def _encode_batcher_loop(self, queue: asyncio.Queue) -> None:
+        """Drain queued queries and encode them with one model call per batch"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + _ENCODE_BATCH_WAIT
+            while len(batch) < _ENCODE_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            texts = [text for text, _ in batch]
+            try:
+                embeddings = await asyncio.to_thread(self._embed_queries, texts)
+                for (_, future), embedding in zip(batch, embeddings):
+                    if not future.done():
+                        future.set_result(embedding)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+    
+    def _embed_queries(self, texts: List[str]) -> np.ndarray:
+        """Unit-normalized query embeddings straight from tokenizer + model forward
+        
+        Skips SentenceTransformer.encode's per-call batching/sorting bookkeeping,
+        which is pure overhead for a handful of short queries.
+        """
+        features = batch_to_device(self.sentence_model.tokenize(texts), self.sentence_model.device)
+        with torch.inference_mode():
+            embeddings = self.sentence_model(features)['sentence_embedding'].float()
+            embeddings = torch.nn.functional.normalize(embeddings, p=2, dim=1)
+        return embeddings.cpu().numpy()
+    
+    def _find_similar_question(self, user_question: str, threshold: float = 0.75,
+                               user_embedding: Optional[np.ndarray] = None) -> Optional[Dict]:
         """Find most similar question from dataset using improved semantic search"""
-        if not self.sentence_model or not self.qa_embeddings or not self.qa_dataset:
+        # len() rather than truthiness: the embeddings are an ndarray, whose bool() raises
+        if not self.sentence_model or len(self.qa_embeddings) == 0 or not self.qa_questions:
             logger.warning("⚠️ Missing required components for semantic search")
             return None
         
-        # Additional safety check for embeddings
-        if len(self.qa_embeddings) == 0 or len(self.qa_dataset) == 0:
-            logger.warning("⚠️ Empty embeddings or dataset")
-            return None
-        
         try:
             # Preprocess user question
             processed_question = self._preprocess_text(user_question)
             logger.info(f"🔍 Processing question: '{user_question}' -> '{processed_question}'")
             
-            # Encode user question
-            user_embedding = self.sentence_model.encode([processed_question])
+            # Encode user question (unless answer() already did it in a batch)
+            if user_embedding is None:
+                user_embedding = self._embed_queries([processed_question])
             
-            # Calculate semantic similarities
-            similarities = np.dot(self.qa_embeddings, user_embedding.T).flatten()
+            # Calculate semantic similarities (cosine, as both sides are unit-normalized)
+            similarities = self.qa_embeddings @ user_embedding.reshape(-1)
             
-            # Find top matches (keep as numpy array for argsort)
-            top_indices = np.argsort(similarities)[::-1][:10]  # Top 10 matches for better selection
+            # Find top matches (partial selection of the 10 best, then order just those)
+            top_k = min(_TOP_MATCHES, len(similarities))
+            top_indices = np.argpartition(similarities, -top_k)[-top_k:]
+            top_indices = top_indices[np.argsort(similarities[top_indices])[::-1]]
             
-            # Convert to list after finding indices
-            similarities = similarities.tolist()
+            # Convert just the candidates to Python numbers, not the whole score vector
+            top_scores = similarities[top_indices].tolist()
             
             best_match = None
             best_score = 0.0
             
-            for idx in top_indices:
-                idx = int(idx)
-                dataset_question = self.qa_dataset[idx]['question']
-                
-                # Semantic similarity
-                semantic_sim = float(similarities[idx])
+            # Extract the user's keywords once; the dataset side was extracted at load
+            user_keywords = self._extract_keywords(processed_question)
+            user_policy_keywords = user_keywords.intersection(_POLICY_KEYWORDS)
+            
+            for idx, semantic_sim in zip(top_indices.tolist(), top_scores):
+                dataset_question = self.qa_questions[idx]
+                dataset_keywords = self._qa_keywords[idx]
                 
                 # Keyword similarity
-                keyword_sim = self._keyword_similarity(processed_question, dataset_question)
+                keyword_sim = self._keyword_similarity(user_keywords, dataset_keywords)
                 
                 # Combined score (weighted average) - increased weight for keywords
                 combined_score = (semantic_sim * 0.5) + (keyword_sim * 0.5)
                 
                 logger.info(f"🔍 Match {idx}: '{dataset_question}' - Semantic: {semantic_sim:.3f}, Keywords: {keyword_sim:.3f}, Combined: {combined_score:.3f}")
                 
-                # Additional validation: check for exact keyword matches
-                user_keywords = self._extract_keywords(processed_question)
-                dataset_keywords = self._extract_keywords(dataset_question)
-                
-                # If user is asking about a specific policy, ensure the dataset question is about the same policy
-                policy_keywords = ['policy', 'policies', 'attendance', 'leave', 'wfh', 'dress', 'conduct', 'handbook', 'onboarding', 'performance', 'reimbursement', 'it', 'device', 'password', 'software', 'helpdesk']
-                user_policy_keywords = user_keywords.intersection(set(policy_keywords))
-                dataset_policy_keywords = dataset_keywords.intersection(set(policy_keywords))
+                # Additional validation: if user is asking about a specific policy,
+                # ensure the dataset question is about the same policy
+                dataset_policy_keywords = dataset_keywords.intersection(_POLICY_KEYWORDS)
                 
                 # If user is asking about a specific policy, dataset must contain similar policy keywords
                 if user_policy_keywords and not dataset_policy_keywords.intersection(user_policy_keywords):
@@ -307,7 +592,8 @@ class HybridQAEngine:
                 if combined_score > best_score:
                     best_score = combined_score
                     best_match = {
-                        'qa_pair': self.qa_dataset[idx],
+                        'question': dataset_question,
+                        'answer': self.qa_answers[idx],
                         'similarity': combined_score,
                         'semantic_similarity': semantic_sim,
                         'keyword_similarity': keyword_sim,
@@ -324,14 +610,14 @@ class HybridQAEngine:
                 adaptive_threshold = threshold + 0.1
             
             # Additional validation for policy questions
-            if 'policy' in processed_question.lower():
+            if 'policy' in processed_question:
                 # For policy questions, require higher threshold
                 adaptive_threshold = max(adaptive_threshold, 0.7)
                 
                 # Ensure the matched question is actually about a policy
                 if best_match:
-                    matched_question = best_match['qa_pair']['question'].lower()
-                    if 'policy' not in matched_question and not any(policy in matched_question for policy in ['attendance', 'leave', 'wfh', 'dress', 'conduct', 'handbook', 'onboarding', 'performance', 'reimbursement', 'it', 'device', 'password', 'software', 'helpdesk']):
+                    matched_question = best_match['question'].lower()
+                    if 'policy' not in matched_question and not any(policy in matched_question for policy in _POLICY_INDICATORS):
                         logger.info(f"⚠️ Policy question matched with non-policy answer: {matched_question}")
                         return None
             
@@ -349,107 +635,127 @@ class HybridQAEngine:
     async def _gemini_answer(self, question: str) -> str:
         """Generate answer using Gemini API"""
         if not self.gemini_model:
-            return "I apologize, but I'm currently unable to process your request. Please try again later."
+            return _GEMINI_UNAVAILABLE
+        
+        # Repeat questions (ignoring case and spacing) reuse the earlier Gemini answer
+        key = _WHITESPACE_RE.sub(' ', question.lower()).strip()
+        cached = self._gemini_cache.get(key)
+        if cached is not None:
+            self._gemini_cache.move_to_end(key)
+            return cached
         
+        # Concurrent copies of the same question share a single Gemini call
+        task = self._gemini_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate_gemini_answer(question, key))
+            self._gemini_inflight[key] = task
+            task.add_done_callback(lambda _: self._gemini_inflight.pop(key, None))
+        
+        # Shield so one caller disconnecting does not cancel the others
+        return await asyncio.shield(task)
+    
+    async def _generate_gemini_answer(self, question: str, key: str) -> str:
+        """Call Gemini for one question and cache a successful answer under key"""
         try:
             # Enhanced prompt for better responses
             company_name = get_company_name()
-            prompt = f"""
-            You are an AI assistant for {company_name}. 
-            Answer the following question about company policies, procedures, or general HR matters.
-            Be helpful, professional, and accurate. If you're not sure about something, say so.
+            prompt = _gemini_prompt_prefix(company_name) + question + _GEMINI_PROMPT_SUFFIX
             
-            **Available Policy Topics:**
-            - Attendance Policy (work hours, tardiness)
-            - Leave Policy (20 days annual leave, submission requirements)
-            - Work From Home Policy (3 days/week, manager approval)
-            - Dress Code Policy (business casual)
-            - Performance Review Policy (bi-annual reviews)
-            - Reimbursement Policy (30-day submission, receipts required)
-            - Code of Conduct (respect, zero tolerance for harassment)
-            - Employee Handbook (mission, values, policies)
-            - Onboarding (2-week program, mandatory training)
-            - IT Policies (device, password, software, helpdesk)
-            
-            **Important Guidelines:**
-            - For general policy questions, provide an overview of the policy
-            - For specific scenarios, provide practical guidance
-            - Always include contact information when relevant
-            - Be friendly and professional in tone
-            - If the question is unclear, ask for clarification
-            - For greetings and emotion-based questions, respond warmly and professionally
-            - For "how are you" type questions, respond positively about being ready to help
-            
-            **Question:** {question}
-            
-            Please provide a clear, helpful response based on the available policy information:
-            """
-            
-            response = await asyncio.to_thread(
-                self.gemini_model.generate_content,
-                prompt
-            )
+            # Native async call: no worker thread is held while waiting on the API
+            response = await self.gemini_model.generate_content_async(prompt)
             
             if response and response.text:
-                return response.text.strip()
+                answer = response.text.strip()
+                self._gemini_cache[key] = answer
+                self._gemini_cache.move_to_end(key)
+                if len(self._gemini_cache) > self.answer_cache_size:
+                    self._gemini_cache.popitem(last=False)
+                return answer
             else:
-                return "I apologize, but I couldn't generate a response. Please try rephrasing your question."
+                return _GEMINI_EMPTY
             
         except Exception as e:
             logger.error(f"❌ Gemini API error: {str(e)}")
-            return "I apologize, but I'm experiencing technical difficulties. Please try again later."
+            return _GEMINI_ERROR
+    
+    def _semantic_cache_get(self, embedding: np.ndarray) -> Optional[str]:
+        """Dataset answer matched by the most similar cached question, if it is close enough"""
+        if not self._semantic_cache_indices:
+            return None
+        sims = self._semantic_cache_vecs[:len(self._semantic_cache_indices)] @ embedding
+        best = int(sims.argmax())
+        if sims[best] >= _SEMANTIC_CACHE_THRESHOLD:
+            return self.qa_answers[self._semantic_cache_indices[best]]
+        return None
+    
+    def _semantic_cache_put(self, embedding: Optional[np.ndarray], qa_index: int) -> str:
+        """Remember the dataset match for this query embedding (ring buffer, oldest overwritten) and return its answer"""
+        answer = self.qa_answers[qa_index]
+        if embedding is None:
+            return answer
+        if self._semantic_cache_vecs is None:
+            self._semantic_cache_vecs = np.zeros((self.semantic_cache_size, embedding.shape[0]), dtype=np.float32)
+        slot = self._semantic_cache_next
+        self._semantic_cache_vecs[slot] = embedding
+        if slot < len(self._semantic_cache_indices):
+            self._semantic_cache_indices[slot] = qa_index
+        else:
+            self._semantic_cache_indices.append(qa_index)
+        self._semantic_cache_next = (slot + 1) % self.semantic_cache_size
+        return answer
     
     async def answer(self, question: str) -> str:
-        """Main method to answer questions using hybrid approach"""
+        """Main method to answer questions using hybrid approach (repeat questions are served from cache)"""
         if not question or not question.strip():
             return "Please provide a question so I can help you."
         
         question = question.strip()
+        key = _WHITESPACE_RE.sub(' ', question.lower())
+        cached = self._answer_cache.get(key)
+        if cached is not None:
+            self._answer_cache.move_to_end(key)
+            return cached
         
-        # Step 0: Handle common greetings and basic questions first
+        result = await self._answer(question)
+        if result not in _TRANSIENT_ANSWERS:
+            self._answer_cache[key] = result
+            self._answer_cache.move_to_end(key)
+            if len(self._answer_cache) > self.answer_cache_size:
+                self._answer_cache.popitem(last=False)
+        return result
+    
+    async def _answer(self, question: str) -> str:
+        """Answer a stripped, non-empty question without consulting the exact-match cache"""
+        # Step 0: Handle common greetings and basic questions first (before any document or semantic work)
         processed_question = self._preprocess_text(question)
         
         # Check for greetings and emotion-based questions
-        greeting_keywords = ['hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening', 'how are you']
-        emotion_keywords = ['how are you', 'how do you feel', 'are you ok', 'are you well', 'how is it going', 'how is everything']
-        
-        if any(greeting in processed_question for greeting in greeting_keywords):
+        if _GREETING_RE.search(processed_question):
             # Try to find exact greeting match first
-            for qa in self.qa_dataset:
-                if isinstance(qa, dict) and 'question' in qa:
-                    qa_lower = qa['question'].lower()
-                    if qa_lower in processed_question or processed_question in qa_lower:
-                        return qa['answer']
+            for qa_lower, qa_answer in self._qa_lookup:
+                if qa_lower in processed_question or processed_question in qa_lower:
+                    return qa_answer
         
         # Check for emotion-based questions specifically
-        if any(emotion in processed_question for emotion in emotion_keywords):
+        if _EMOTION_RE.search(processed_question):
             # Look for the "how are you" response specifically
-            for qa in self.qa_dataset:
-                if isinstance(qa, dict) and 'question' in qa:
-                    if 'how are you' in qa['question'].lower():
-                        return qa['answer']
+            for qa_lower, qa_answer in self._qa_lookup:
+                if 'how are you' in qa_lower:
+                    return qa_answer
         
         # Check for "what can you do" type questions
-        capability_keywords = ['what can you do', 'help', 'capabilities', 'features']
-        if any(keyword in processed_question for keyword in capability_keywords):
-            for qa in self.qa_dataset:
-                if isinstance(qa, dict) and 'question' in qa:
-                    if 'what can you do' in qa['question'].lower() or 'help' in qa['question'].lower():
-                        return qa['answer']
+        if _CAPABILITY_RE.search(processed_question):
+            for qa_lower, qa_answer in self._qa_lookup:
+                if 'what can you do' in qa_lower or 'help' in qa_lower:
+                    return qa_answer
         
         # Step 1: Check for document request keywords and numeric selections
-        document_keywords = [
-            'document', 'need document', 'request document', 'get document', 'want document',
-            'experience letter', 'employment letter', 'salary slip', 'form 16', 'bonafide',
-            'certificate', 'noc', 'relieving letter', 'offer letter', 'appointment letter',
-            'promotion letter', 'pf statement', 'uan details', 'medical insurance',
-            'id card', 'visa support', 'travel authorization'
-        ]
+        question_lower = question.lower()
         
         # Check if it's a numeric document selection (1-16)
-        if self.doc_handler and question.strip().isdigit() and 1 <= int(question.strip()) <= 16:
+        if question in _DOCUMENT_NUMBERS and self.doc_handler:
             try:
-                doc_number = question.strip()
+                doc_number = question
                 doc_name = self.doc_handler.supported_documents.get(doc_number)
                 if doc_name:
                     logger.info(f"📄 User selected document: {doc_number} - {doc_name}")
@@ -458,32 +764,18 @@ class HybridQAEngine:
                 logger.error(f"❌ Document selection error: {str(e)}")
         
         # Check if user is providing document details (contains common document-related keywords)
-        if self.doc_handler and any(keyword in question.lower() for keyword in ['name:', 'employee id:', 'id:', 'department:', 'designation:', 'joining date:', 'purpose:']):
+        if _DOCUMENT_DETAILS_RE.search(question_lower) and self.doc_handler:
             try:
                 # This looks like document details being provided
-                return """📝 **Document Request Details Received**
-
-Thank you for providing the details! I've received your document request information.
-
-**Next Steps:**
-1. Your request has been logged in our system
-2. HR will review and process your request
-3. You'll receive a confirmation email with tracking details
-4. The document will be generated and sent to you within 2-3 business days
-
-**Contact HR:**
-• Email: {company_email}
-• Phone: Available through internal directory
-
-If you need immediate assistance, please contact HR directly."""
+                return _DOCUMENT_DETAILS_RECEIVED
             except Exception as e:
                 logger.error(f"❌ Document details processing error: {str(e)}")
         
         # Check for document request keywords
-        if self.doc_handler and any(keyword in question.lower() for keyword in document_keywords):
+        if _DOCUMENT_REQUEST_RE.search(question_lower) and self.doc_handler:
             try:
                 # Check if it's a specific document request
-                if any(specific_doc in question.lower() for specific_doc in ['experience letter', 'employment letter', 'salary slip', 'form 16', 'bonafide', 'certificate']):
+                if _SPECIFIC_DOCUMENT_RE.search(question_lower):
                     # Use the specific document handler
                     return self._handle_specific_document_request(question)
                 
@@ -494,7 +786,15 @@ If you need immediate assistance, please contact HR directly."""
         
         # Step 2: Try semantic search in local dataset
         try:
-            similar_qa = self._find_similar_question(question)
+            user_embedding = None
+            if self.sentence_model is not None and len(self.qa_embeddings) > 0:
+                user_embedding = await self._encode_query(processed_question)
+                
+                # A close paraphrase of a recently matched question gets the same dataset answer without re-searching
+                cached = self._semantic_cache_get(user_embedding)
+                if cached is not None:
+                    return cached
+            similar_qa = self._find_similar_question(question, user_embedding=user_embedding)
             
             if similar_qa:
                 similarity_score = float(similar_qa['similarity'])
@@ -507,15 +807,14 @@ If you need immediate assistance, please contact HR directly."""
                 threshold = 0.7  # Increased base threshold
                 
                 # For policy questions, require higher threshold
-                if 'policy' in processed_question.lower():
+                if 'policy' in processed_question:
                     threshold = 0.75  # Higher threshold for policy questions
                     
                     # Additional validation for policy questions
-                    qa_question = similar_qa['qa_pair']['question'].lower()
+                    qa_question = similar_qa['question'].lower()
                     
                     # Check if the matched question is actually about a policy
-                    policy_indicators = ['policy', 'attendance', 'leave', 'wfh', 'dress', 'conduct', 'handbook', 'onboarding', 'performance', 'reimbursement', 'it', 'device', 'password', 'software', 'helpdesk']
-                    if not any(indicator in qa_question for indicator in policy_indicators):
+                    if not any(indicator in qa_question for indicator in _POLICY_INDICATORS):
                         logger.info(f"⚠️ Policy question matched with non-policy answer: {qa_question}")
                         # Continue to next step instead of returning incorrect answer
                         pass
@@ -535,7 +834,7 @@ If you need immediate assistance, please contact HR directly."""
                         threshold = 0.65  # Lower threshold for high-quality matches
                 
                 if similarity_score >= threshold:
-                    return similar_qa['qa_pair']['answer']
+                    return self._semantic_cache_put(user_embedding, similar_qa['index'])
                 else:
                     logger.info(f"⚠️ Similarity score {similarity_score:.3f} below threshold {threshold}")
         except Exception as e:
@@ -552,33 +851,35 @@ If you need immediate assistance, please contact HR directly."""
                 best_keyword_match = None
                 best_keyword_score = 0.0
                 
-                for i, qa in enumerate(self.qa_dataset):
-                    dataset_keywords = self._extract_keywords(qa['question'])
-                    if dataset_keywords:
-                        keyword_sim = self._keyword_similarity(question, qa['question'])
+                # Only rows sharing a keyword can score above zero; visit them in dataset order
+                candidates = sorted({i for keyword in user_keywords for i in self._keyword_index.get(keyword, ())})
+                for i in candidates:
+                    dataset_question = self.qa_questions[i]
+                    keyword_sim = self._keyword_similarity(user_keywords, self._qa_keywords[i])
+                    
+                    # Higher threshold for keyword matching
+                    if keyword_sim > best_keyword_score and keyword_sim > 0.5:  # Increased minimum threshold
+                        # Additional validation for policy questions
+                        if 'policy' in processed_question:
+                            qa_question = dataset_question.lower()
+                            if not any(indicator in qa_question for indicator in _POLICY_INDICATORS):
+                                logger.info(f"⚠️ Policy question keyword match with non-policy answer: {qa_question}")
+                                continue
                         
-                        # Higher threshold for keyword matching
-                        if keyword_sim > best_keyword_score and keyword_sim > 0.5:  # Increased minimum threshold
-                            # Additional validation for policy questions
-                            if 'policy' in processed_question.lower():
-                                qa_question = qa['question'].lower()
-                                policy_indicators = ['policy', 'attendance', 'leave', 'wfh', 'dress', 'conduct', 'handbook', 'onboarding', 'performance', 'reimbursement', 'it', 'device', 'password', 'software', 'helpdesk']
-                                if not any(indicator in qa_question for indicator in policy_indicators):
-                                    logger.info(f"⚠️ Policy question keyword match with non-policy answer: {qa_question}")
-                                    continue
-                            
-                            best_keyword_score = keyword_sim
-                            best_keyword_match = {
-                                'qa_pair': qa,
-                                'similarity': keyword_sim,
-                                'index': i
-                            }
+                        best_keyword_score = keyword_sim
+                        best_keyword_match = {
+                            'question': dataset_question,
+                            'answer': self.qa_answers[i],
+                            'similarity': keyword_sim,
+                            'index': i
+                        }
                 
                 if best_keyword_match and best_keyword_match['similarity'] > 0.6:  # Higher final threshold
                     logger.info(f"✅ Found keyword-based match (score: {best_keyword_match['similarity']:.3f})")
-                    return best_keyword_match['qa_pair']['answer']
+                    return best_keyword_match['answer']
                 else:
-                    logger.info(f"⚠️ Keyword match score {best_keyword_match['similarity']:.3f if best_keyword_match else 0:.3f} below threshold 0.6")
+                    best_similarity = best_keyword_match['similarity'] if best_keyword_match else 0.0
+                    logger.info(f"⚠️ Keyword match score {best_similarity:.3f} below threshold 0.6")
         except Exception as e:
             logger.error(f"❌ Error in keyword fallback: {str(e)}")
         
@@ -686,10 +987,14 @@ You can also use our Document Request System by typing "I need a document" and s
         return {
             "gemini_model": self.gemini_model is not None,
             "sentence_model": self.sentence_model is not None,
-            "qa_dataset_loaded": len(self.qa_dataset) > 0,
+            "qa_dataset_loaded": len(self.qa_questions) > 0,
             "qa_embeddings_ready": len(self.qa_embeddings) > 0,
             "document_handler": self.doc_handler is not None,
-            "total_qa_pairs": len(self.qa_dataset)
+            "total_qa_pairs": len(self.qa_questions)
         }
 
 
+@lru_cache(maxsize=1)
+def get_qa_engine() -> HybridQAEngine:
+    """Get the shared HybridQAEngine so the sentence model and embeddings are loaded once per process"""
+    return HybridQAEngine()
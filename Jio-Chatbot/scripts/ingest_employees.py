@@ -11,6 +11,11 @@ import sys
 from pathlib import Path
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 REQUIRED_FIELDS = [
     "emp_id",
@@ -33,6 +38,9 @@ ALT_HEADERS = {
     "email": ["email", "Email", "EmailID", "EmailId"],
 }
 
+# Digit runs in non-numeric IDs such as "EMP-0042", compiled once for all rows
+DIGITS_RE = re.compile(r"\d+")
+
 def find_col(fieldnames: list[str], candidates: list[str]) -> str | None:
     lower = {f.lower(): f for f in fieldnames}
     for c in candidates:
@@ -71,7 +79,7 @@ def main(csv_path: str) -> None:
                 try:
                     emp_id = int(emp_id_str)
                 except ValueError:
-                    digits = re.findall(r"\d+", emp_id_str)
+                    digits = DIGITS_RE.findall(emp_id_str)
                     if not digits:
                         raise ValueError(f"emp_id lacks digits: {emp_id_str}")
                     emp_id = int("".join(digits))
@@ -103,8 +111,11 @@ def main(csv_path: str) -> None:
 
     out = Path(__file__).resolve().parents[1] / "backend" / "app" / "data" / "employees.json"
     out.parent.mkdir(parents=True, exist_ok=True)
-    with out.open("w", encoding="utf-8") as f:
-        json.dump(rows, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        out.write_bytes(orjson.dumps(rows, option=orjson.OPT_INDENT_2))
+    else:
+        with out.open("w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
     print(f"Wrote {len(rows)} employees to {out}")
 
 